@@ -34,6 +34,14 @@ def run_app(argv: Sequence[str]) -> int:
     # Qt global attribute (required for some WebEngine/OpenGL scenarios)
     QGuiApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts, True)
 
+    # The WebEngine preview's URL scheme has to be declared before the QApplication exists.
+    try:
+        from pymd.services.ui.doc_scheme import register_preview_scheme
+
+        register_preview_scheme()
+    except Exception:
+        pass  # no Qt WebEngine: the preview falls back to QTextBrowser
+
     # App identity (QSettings namespace, etc.)
     QApplication.setOrganizationName(APP_ORG)
     QApplication.setApplicationName(APP_NAME)
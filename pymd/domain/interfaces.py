@@ -7,7 +7,12 @@ from typing import Protocol
 
 
 class IMarkdownRenderer(Protocol):
-    """Convert Markdown text to full HTML string (including CSS)."""
+    """
+    Convert Markdown text to full HTML string (including CSS).
+
+    The main window calls to_html() from a QThreadPool worker, so implementations
+    must not touch Qt widgets and must tolerate concurrent calls.
+    """
 
     def to_html(self, markdown_text: str) -> str: ...
 
@@ -37,6 +42,21 @@ class ISettingsService(Protocol):
 
     def set_recent(self, recent: Iterable[str]) -> None: ...
 
+    # Preview re-render delay after the last edit, in milliseconds
+    def get_preview_debounce_ms(self) -> int: ...
+
+    # Let a text preview parse Markdown itself (render/native_markdown: on/off)
+    def get_native_markdown(self) -> bool: ...
+
+    # Write several of the above in one go (one sync); None leaves a value untouched.
+    def save_all(
+        self,
+        *,
+        geometry: bytes | None = None,
+        splitter: bytes | None = None,
+        recents: Iterable[str] | None = None,
+    ) -> None: ...
+
     # Generic key/value (used by plugins state store etc.)
     def get_raw(self, key: str, default: str | None = None) -> str | None: ...
 
@@ -48,6 +68,8 @@ class IExporter(ABC):
 
     name: str  # e.g. "html", "pdf"
     label: str  # e.g. "Export HTML…"
+    # True if export() may run on a worker thread (no widgets, QTextDocument, WebEngine).
+    thread_safe: bool = False
 
     @abstractmethod
     def export(self, html: str, out_path: Path) -> None:
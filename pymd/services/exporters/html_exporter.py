@@ -9,6 +9,7 @@ class HtmlExporter(IExporter):
     name = "html"
     label = "Export HTML…"
     file_ext = "html"
+    thread_safe = True  # plain file write
 
     def export(self, html: str, out_path: Path) -> None:
         out_path.write_text(html, encoding="utf-8")
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import re
+
+# Name prefix of the per-block anchors emitted by MarkdownRenderer.to_anchored_html().
+BLOCK_ANCHOR_PREFIX = "blk-"
+
+# Opening/closing code fences at top level (up to 3 spaces of indent, per CommonMark).
+_FENCE_RE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+# Start of a list item: "-", "*", "+", "1." or "1)" followed by whitespace.
+_LIST_ITEM_RE = re.compile(r"^ {0,3}(?:[-*+]|\d+[.)])[ \t]")
+# A blockquote line; Markdown merges blockquotes separated only by blank lines.
+_QUOTE_RE = re.compile(r"^ {0,3}>")
+# Constructs whose output depends on text outside their own block: reference links,
+# footnotes, abbreviations and [TOC] resolve across the whole document; a definition
+# (": ...") attaches to the term or list before it; a raw HTML block runs to its closing
+# tag, across blank lines. Void tags (e.g. the editor's own <img>) can't span blocks.
+_DOC_SCOPE_RE = re.compile(
+    r"^ {0,3}(?:\[[^\]\n]+\]:|\*\[[^\]\n]+\]:|\[TOC\]|:[ \t]"
+    r"|<(?![Ii][Mm][Gg]\b|[Bb][Rr]\b|[Hh][Rr]\b)[A-Za-z!?/])",
+    re.MULTILINE,
+)
+
+
+def split_blocks(text: str) -> list[str]:
+    """
+    Split Markdown source into top-level blocks at blank lines.
+
+    Anything Markdown treats as one unit stays together: fenced code (even with blank
+    lines inside), indented continuation lines, the items of a loose list and runs of
+    blockquotes. Unless has_document_scope() is true, each block renders on its own as
+    it does inside the whole text, apart from heading ids (the toc extension numbers
+    repeated headings; MarkdownRenderer.to_html_blocks() checks for that).
+    """
+    blocks: list[str] = []
+    lines: list[str] = []
+    blanks: list[str] = []
+    fence = ""
+
+    for line in text.split("\n"):
+        if fence:
+            lines.append(line)
+            m = _FENCE_RE.match(line)
+            if m and m.group(1)[0] == fence[0] and len(m.group(1)) >= len(fence):
+                if not line[m.end() :].strip():
+                    fence = ""
+            continue
+
+        if not line.strip():
+            if lines:
+                blanks.append(line)
+            continue
+
+        if blanks:
+            continues = (
+                line[0] in " \t"
+                or (
+                    _LIST_ITEM_RE.match(line) is not None
+                    and _LIST_ITEM_RE.match(lines[0]) is not None
+                )
+                or (_QUOTE_RE.match(line) is not None and any(map(_QUOTE_RE.match, lines)))
+            )
+            if continues:
+                lines.extend(blanks)
+            else:
+                blocks.append("\n".join(lines))
+                lines = []
+            blanks = []
+
+        m = _FENCE_RE.match(line)
+        if m:
+            fence = m.group(1)
+        lines.append(line)
+
+    if lines:
+        blocks.append("\n".join(lines))
+    return blocks
+
+
+def has_document_scope(text: str) -> bool:
+    """True if `text` uses constructs that only render correctly as a whole document."""
+    return _DOC_SCOPE_RE.search(text) is not None
@@ -1,15 +1,22 @@
 # pymd/services/markdown_renderer.py
 from __future__ import annotations
 
+import re
+import threading
+from collections import OrderedDict
 from typing import Literal
 
 import markdown
 
 from pymd.domain.interfaces import IMarkdownRenderer
-from pymd.utils.constants import CSS_PREVIEW, HTML_TEMPLATE
+from pymd.services.markdown_blocks import BLOCK_ANCHOR_PREFIX, has_document_scope, split_blocks
+from pymd.utils.constants import BLOCK_CACHE_SIZE, CSS_PREVIEW, HTML_TEMPLATE, RETYPESET_HOOK
 
 MathEngine = Literal["mathjax", "katex"]
 
+# id attributes in rendered HTML (headings get them from the toc extension).
+_ID_RE = re.compile(r'\sid="([^"]*)"')
+
 
 class MarkdownRenderer(IMarkdownRenderer):
     """
@@ -21,8 +28,79 @@ class MarkdownRenderer(IMarkdownRenderer):
 
     def __init__(self, math_engine: MathEngine = "mathjax") -> None:
         self.math_engine: MathEngine = math_engine
+        # Block source -> body HTML (LRU). A block renders the same wherever it appears,
+        # so an edit only re-renders the blocks it touched. Shared by render threads.
+        self._block_cache: OrderedDict[str, str] = OrderedDict()
+        self._block_lock = threading.Lock()
 
     def to_html(self, markdown_text: str) -> str:
+        return self.to_document(self._new_markdown().convert(markdown_text))
+
+    def to_html_blocks(self, markdown_text: str) -> list[str] | None:
+        """
+        Body HTML of each top-level block (see split_blocks), rendered with one reused
+        Markdown instance. None if the blocks would not add up to to_html(): the text
+        uses whole-document constructs (see has_document_scope), or two blocks produce
+        the same id (e.g. repeated headings, which the whole document numbers usage_1...).
+        """
+        if has_document_scope(markdown_text):
+            return None
+        blocks = split_blocks(markdown_text)
+        with self._block_lock:
+            cached = [self._block_cache.get(block) for block in blocks]
+        md: markdown.Markdown | None = None
+        out: list[str] = []
+        for block, html in zip(blocks, cached, strict=True):
+            if html is None:
+                if md is None:
+                    md = self._new_markdown()
+                html = md.reset().convert(block)
+            out.append(html)
+
+        with self._block_lock:
+            cache = self._block_cache
+            for block, html in zip(blocks, out, strict=True):
+                cache[block] = html
+                cache.move_to_end(block)
+            # Always room for the whole current document, or a long one would evict itself.
+            limit = max(BLOCK_CACHE_SIZE, len(blocks))
+            while len(cache) > limit:
+                cache.popitem(last=False)
+
+        ids = [i for html in out for i in _ID_RE.findall(html)]
+        if len(ids) != len(set(ids)):
+            return None
+        return out
+
+    def to_anchored_html(self, markdown_text: str) -> str:
+        """
+        Like to_html(), but every top-level block is preceded by <a name="blk-N"></a>, so a
+        preview can scroll back to the same block after re-rendering. Falls back to
+        to_html() when to_html_blocks() can't split the text.
+        """
+        blocks = self.to_html_blocks(markdown_text)
+        if blocks is None:
+            return self.to_html(markdown_text)
+        return self.to_document(
+            "\n".join(f'<a name="{BLOCK_ANCHOR_PREFIX}{i}"></a>{b}' for i, b in enumerate(blocks))
+        )
+
+    def to_document(self, body: str) -> str:
+        """Wrap rendered body HTML in the preview template (CSS + math assets)."""
+        # Inject CSS + math assets. We add math scripts *inside* the body so even if the
+        # outer template is fixed, a JS-capable preview can still execute them.
+        math_assets = self._math_assets(self.math_engine)
+
+        # NOTE:
+        # - If your HTML_TEMPLATE already has <head> injection points, you can place the
+        #   CSS there. To keep this module drop-in, we concatenate CSS and scripts here.
+        return HTML_TEMPLATE.format(
+            css=CSS_PREVIEW + math_assets["css"], body=body + math_assets["scripts"]
+        )
+
+    # -------------------- helpers --------------------
+
+    def _new_markdown(self) -> markdown.Markdown:
         # Extensions for Markdown + math wrappers
         exts = [
             "extra",
@@ -45,26 +123,8 @@ class MarkdownRenderer(IMarkdownRenderer):
             },
         }
 
-        body = markdown.markdown(
-            markdown_text,
-            extensions=exts,
-            extension_configs=ext_cfg,
-            output_format="html5",
-        )
-
-        # Inject CSS + math assets. We add math scripts *inside* the body so even if the
-        # outer template is fixed, a JS-capable preview can still execute them.
-        math_assets = self._math_assets(self.math_engine)
-
-        # NOTE:
-        # - If your HTML_TEMPLATE already has <head> injection points, you can place the
-        #   CSS there. To keep this module drop-in, we concatenate CSS and scripts here.
-        html = HTML_TEMPLATE.format(
-            css=CSS_PREVIEW + math_assets["css"], body=body + math_assets["scripts"]
-        )
-        return html
-
-    # -------------------- helpers --------------------
+        # A fresh instance per call keeps to_html() safe to run concurrently.
+        return markdown.Markdown(extensions=exts, extension_configs=ext_cfg, output_format="html5")
 
     def _math_assets(self, engine: MathEngine) -> dict[str, str]:
         if engine == "katex":
@@ -74,7 +134,8 @@ class MarkdownRenderer(IMarkdownRenderer):
                 '<link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/katex@0.16.10/dist/katex.min.css" '  # noqa: E501
                 'integrity="sha384-wK3nQhH0cVZr7r8Y8sE0t4f2C7dYc8H3D8uQAu0QH3Tt/3jQ8b0EYYlq6QnZ6Z0v" crossorigin="anonymous">'  # noqa: E501
             )
-            katex_js = """
+            katex_js = (
+                """
 <script defer src="https://cdn.jsdelivr.net/npm/katex@0.16.10/dist/katex.min.js"
         integrity="sha384-B4s6f0U6d0qf9q0kY1n5i3bU8mQe9f3pTeHqLq5Nn5kQnG7s8oKp4zH2Q6JjQn6b"
         crossorigin="anonymous"></script>
@@ -82,26 +143,35 @@ class MarkdownRenderer(IMarkdownRenderer):
         integrity="sha384-vZTG03ZVvbG5B6GJk8GgB4n8x4QzE8q5Z1sBfU+Ww2k7x0c6K7V3WfK8Q+z4i1sY"
         crossorigin="anonymous"></script>
 <script>
+var pymdKatexOptions = {
+  delimiters: [
+    {left: "$$", right: "$$", display: true},
+    {left: "$",  right: "$",  display: false},
+    {left: "\\\\(", right: "\\\\)", display: false},
+    {left: "\\\\[", right: "\\\\]", display: true}
+  ],
+  ignoredTags: ["script", "noscript", "style", "textarea", "pre", "code"]
+};
 document.addEventListener("DOMContentLoaded", function() {
   if (typeof renderMathInElement === "function") {
-    renderMathInElement(document.body, {
-      delimiters: [
-        {left: "$$", right: "$$", display: true},
-        {left: "$",  right: "$",  display: false},
-        {left: "\\\\(", right: "\\\\)", display: false},
-        {left: "\\\\[", right: "\\\\]", display: true}
-      ],
-      ignoredTags: ["script", "noscript", "style", "textarea", "pre", "code"]
-    });
+    renderMathInElement(document.body, pymdKatexOptions);
   }
 });
+window."""
+                + RETYPESET_HOOK
+                + """ = function (added, removed) {
+  if (typeof renderMathInElement !== "function") return;
+  added.forEach(function (el) { renderMathInElement(el, pymdKatexOptions); });
+};
 </script>
 """
+            )
             return {"css": katex_css, "scripts": katex_js}
 
         # Default: MathJax v3
         # Configure inline and display delimiters, escape handling, and skip pre/code.
-        mathjax_cfg = """
+        mathjax_cfg = (
+            """
 <script>
 window.MathJax = {
   tex: {
@@ -113,8 +183,18 @@ window.MathJax = {
     skipHtmlTags: ['script', 'noscript', 'style', 'textarea', 'pre', 'code']
   }
 };
+// Patched preview: forget math in removed nodes, typeset the new ones. Before MathJax
+// has loaded there is nothing to do: its startup typesets the whole page.
+window."""
+            + RETYPESET_HOOK
+            + """ = function (added, removed) {
+  if (!MathJax.typesetPromise) return;
+  if (MathJax.typesetClear) MathJax.typesetClear(removed);
+  if (added.length) MathJax.typesetPromise(added);
+};
 </script>
 """
+        )
         mathjax_js = (
             '<script id="MathJax-script" async '
             'src="https://cdn.jsdelivr.net/npm/mathjax@3/es5/tex-chtml.js"></script>'
@@ -5,7 +5,14 @@ from collections.abc import Iterable
 from PyQt6.QtCore import QByteArray, QSettings
 
 from pymd.domain.interfaces import ISettingsService
-from pymd.utils.constants import SETTINGS_GEOMETRY, SETTINGS_RECENTS, SETTINGS_SPLITTER
+from pymd.utils.constants import (
+    PREVIEW_DEBOUNCE_MS,
+    SETTINGS_GEOMETRY,
+    SETTINGS_NATIVE_MARKDOWN,
+    SETTINGS_PREVIEW_DEBOUNCE,
+    SETTINGS_RECENTS,
+    SETTINGS_SPLITTER,
+)
 
 
 class SettingsService(ISettingsService):
@@ -32,6 +39,18 @@ class SettingsService(ISettingsService):
         v = self._s.value(SETTINGS_RECENTS, [])
         return [str(x) for x in v] if isinstance(v, list) else []
 
+    def get_preview_debounce_ms(self) -> int:
+        try:
+            return max(0, int(self._s.value(SETTINGS_PREVIEW_DEBOUNCE, PREVIEW_DEBOUNCE_MS)))
+        except (TypeError, ValueError):
+            return PREVIEW_DEBOUNCE_MS
+
+    def get_native_markdown(self) -> bool:
+        v = self._s.value(SETTINGS_NATIVE_MARKDOWN, False)
+        if isinstance(v, bool):
+            return v
+        return str(v).strip().lower() in ("on", "true", "yes", "1")
+
     def get_raw(self, key: str, default=None):
         return self._s.value(key, default)
 
@@ -40,3 +59,18 @@ class SettingsService(ISettingsService):
 
     def set_recent(self, recent: Iterable[str]) -> None:
         self._s.setValue(SETTINGS_RECENTS, list(recent))
+
+    def save_all(
+        self,
+        *,
+        geometry: bytes | None = None,
+        splitter: bytes | None = None,
+        recents: Iterable[str] | None = None,
+    ) -> None:
+        if geometry is not None:
+            self._s.setValue(SETTINGS_GEOMETRY, QByteArray(geometry))
+        if splitter is not None:
+            self._s.setValue(SETTINGS_SPLITTER, QByteArray(splitter))
+        if recents is not None:
+            self._s.setValue(SETTINGS_RECENTS, list(recents))
+        self._s.sync()
@@ -13,8 +13,8 @@ from PyQt6.QtWidgets import (
     QHBoxLayout,
     QLabel,
     QLineEdit,
+    QPlainTextEdit,
     QPushButton,
-    QTextEdit,
     QVBoxLayout,
 )
 
@@ -64,7 +64,7 @@ class QtFindReplaceDialogService(QtWidgets.QDialog):
     replace_signal = pyqtSignal(str, str, bool, bool)
     replace_all_signal = pyqtSignal(str, str, bool, bool)
 
-    def __init__(self, parent: Any, editor: QTextEdit) -> None:
+    def __init__(self, parent: Any, editor: QPlainTextEdit) -> None:
         super().__init__(parent)
         self.parent = parent
         self.editor = editor
@@ -1,11 +1,11 @@
 from PyQt6.QtGui import QTextCursor
-from PyQt6.QtWidgets import QTextEdit
+from PyQt6.QtWidgets import QPlainTextEdit
 
 
 class QtTextEditorAdapter:
-    """Narrow adapter to satisfy EditorPort; isolates service from full QTextEdit API."""
+    """Narrow adapter to satisfy EditorPort; isolates service from full QPlainTextEdit API."""
 
-    def __init__(self, edit: QTextEdit):
+    def __init__(self, edit: QPlainTextEdit):
         self._e = edit
 
     def textCursor(self) -> QTextCursor:
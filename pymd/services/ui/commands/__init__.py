@@ -1,9 +1,10 @@
 from __future__ import annotations
 
-from .prefix_lines import PrefixLines
+from .prefix_lines import PrefixLines, prefix_each_line
 from .surround_selection import SurroundSelection
 
 __all__ = [
     "PrefixLines",
     "SurroundSelection",
+    "prefix_each_line",
 ]
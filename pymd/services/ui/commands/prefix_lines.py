@@ -2,7 +2,13 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
-from PyQt6.QtWidgets import QTextEdit
+from PyQt6.QtGui import QTextCursor
+from PyQt6.QtWidgets import QPlainTextEdit
+
+
+def prefix_each_line(text: str, prefix: str) -> str:
+    """`text` with `prefix` inserted (literally) at the start of every line."""
+    return prefix + text.replace("\n", "\n" + prefix)
 
 
 @dataclass(frozen=True)
@@ -11,7 +17,7 @@ class PrefixLines:
     Command: prefix each selected line (or the current line if no selection) with `prefix`.
     """
 
-    edit: QTextEdit
+    edit: QPlainTextEdit
     prefix: str
 
     def execute(self) -> None:
@@ -30,17 +36,14 @@ class PrefixLines:
             tc.endEditBlock()
             return
 
-        # Multi-line selection: prefix every block touched by the selection
+        # Multi-line selection: rewrite every block touched by the selection with a single
+        # insert (one document mutation and one textChanged, not one per line).
+        first = doc.findBlock(start)
+        last = doc.findBlock(max(end - 1, start))
         tc = self.edit.textCursor()
+        tc.setPosition(first.position())
+        tc.setPosition(last.position() + last.length() - 1, QTextCursor.MoveMode.KeepAnchor)
+        text = tc.selectedText().replace("\u2029", "\n")
         tc.beginEditBlock()
-        blk = doc.findBlock(start)
-        last_pos = max(end - 1, start)
-        last_block = doc.findBlock(last_pos)
-        while blk.isValid():
-            ins = self.edit.textCursor()
-            ins.setPosition(blk.position())
-            ins.insertText(self.prefix)
-            if blk == last_block:
-                break
-            blk = blk.next()
+        tc.insertText(prefix_each_line(text, self.prefix))
         tc.endEditBlock()
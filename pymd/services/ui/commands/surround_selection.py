@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 
-from PyQt6.QtWidgets import QTextEdit
+from PyQt6.QtWidgets import QPlainTextEdit
 
 
 @dataclass(frozen=True)
@@ -12,7 +12,7 @@ class SurroundSelection:
     If no selection, insert the pair and place the cursor between them.
     """
 
-    edit: QTextEdit
+    edit: QPlainTextEdit
     prefix: str
     suffix: str
 
@@ -0,0 +1,58 @@
+# pymd/services/ui/doc_scheme.py
+from __future__ import annotations
+
+from collections.abc import Callable
+from pathlib import Path
+
+from PyQt6.QtCore import QBuffer, QIODevice, QMimeDatabase, QObject, QUrl
+from PyQt6.QtWebEngineCore import (  # type: ignore
+    QWebEngineUrlRequestJob,
+    QWebEngineUrlScheme,
+    QWebEngineUrlSchemeHandler,
+)
+
+from pymd.utils.constants import PREVIEW_SCHEME
+
+
+def register_preview_scheme() -> None:
+    """Declare PREVIEW_SCHEME to Qt WebEngine. Must run before the QApplication exists."""
+    scheme = QWebEngineUrlScheme(PREVIEW_SCHEME.encode())
+    scheme.setSyntax(QWebEngineUrlScheme.Syntax.Path)
+    QWebEngineUrlScheme.registerScheme(scheme)
+
+
+class DocSchemeHandler(QWebEngineUrlSchemeHandler):
+    """
+    Serve images from the document's folder to the WebEngine preview.
+
+    The preview page's base URL is the document folder under PREVIEW_SCHEME rather than
+    file://, so relative image paths still resolve while scripts in the (untrusted)
+    Markdown get neither file:// access nor anything here but images under `folder()`.
+    """
+
+    def __init__(self, folder: Callable[[], Path], parent: QObject | None = None) -> None:
+        super().__init__(parent)
+        self._folder = folder
+        self._mime = QMimeDatabase()
+
+    def requestStarted(self, job: QWebEngineUrlRequestJob) -> None:
+        url = QUrl(job.requestUrl())
+        url.setScheme("file")
+        path = Path(url.toLocalFile()).resolve()
+        mime = self._mime.mimeTypeForFile(str(path), QMimeDatabase.MatchMode.MatchExtension).name()
+        if (
+            not mime.startswith("image/")
+            or not path.is_relative_to(self._folder().resolve())
+            or not path.is_file()
+        ):
+            job.fail(QWebEngineUrlRequestJob.Error.UrlNotFound)
+            return
+        try:
+            data = path.read_bytes()
+        except OSError:
+            job.fail(QWebEngineUrlRequestJob.Error.RequestFailed)
+            return
+        buf = QBuffer(job)  # freed with the job
+        buf.setData(data)
+        buf.open(QIODevice.OpenModeFlag.ReadOnly)
+        job.reply(mime.encode(), buf)
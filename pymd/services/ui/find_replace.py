@@ -11,8 +11,8 @@ from PyQt6.QtWidgets import (
     QHBoxLayout,
     QLabel,
     QLineEdit,
+    QPlainTextEdit,
     QPushButton,
-    QTextEdit,
     QVBoxLayout,
 )
 
@@ -127,9 +127,9 @@ class PlainTextSearchService:
 
 
 class QtTextEditorAdapter:
-    """Narrow adapter to satisfy EditorPort; isolates service from full QTextEdit API."""
+    """Narrow adapter to satisfy EditorPort; isolates service from full QPlainTextEdit API."""
 
-    def __init__(self, edit: QTextEdit):
+    def __init__(self, edit: QPlainTextEdit):
         self._e = edit
 
     def textCursor(self) -> QTextCursor:
@@ -153,7 +153,7 @@ class QtTextEditorAdapter:
 class FindReplaceDialog(QDialog):
     """Non-modal find/replace dialog backed by PlainTextSearchService."""
 
-    def __init__(self, editor: QTextEdit, parent=None):
+    def __init__(self, editor: QPlainTextEdit, parent=None):
         super().__init__(parent)
         self.setWindowTitle("Find / Replace")
         self.setModal(False)
@@ -1,12 +1,24 @@
 from __future__ import annotations
 
 import os
+from collections import OrderedDict
 from collections.abc import Callable, Iterable
+from functools import partial
+from html import escape
 from pathlib import Path
 from typing import Any
 
-from PyQt6.QtCore import QByteArray, QEvent, Qt
-from PyQt6.QtGui import QAction, QKeyEvent, QKeySequence, QTextCursor
+from PyQt6.QtCore import (
+    QCoreApplication,
+    QEvent,
+    QPoint,
+    QSignalBlocker,
+    Qt,
+    QThreadPool,
+    QTimer,
+    QUrl,
+)
+from PyQt6.QtGui import QAction, QFontMetricsF, QKeyEvent, QKeySequence, QTextCursor
 from PyQt6.QtWidgets import (
     QApplication,
     QFileDialog,
@@ -14,22 +26,76 @@ from PyQt6.QtWidgets import (
     QMainWindow,
     QMenu,
     QMessageBox,
+    QPlainTextEdit,
     QSplitter,
     QStatusBar,
     QTextBrowser,
-    QTextEdit,
     QToolBar,
+    QToolButton,
+    QWidget,
 )
 
 from pymd.domain.interfaces import IAppConfig, IFileService, IMarkdownRenderer, ISettingsService
 from pymd.domain.models import Document
 from pymd.services.exporters.base import ExporterRegistryInst, IExporterRegistry
+from pymd.services.markdown_blocks import BLOCK_ANCHOR_PREFIX, has_document_scope, split_blocks
 from pymd.services.ui.about import AboutDialog
+from pymd.services.ui.commands import prefix_each_line
 from pymd.services.ui.create_link import CreateLinkDialog
 from pymd.services.ui.find_replace import FindReplaceDialog
 from pymd.services.ui.plugins_dialog import InstalledPluginRow, PluginsDialog
+from pymd.services.ui.preview_patch import blocks_html, diff_blocks, patch_script
 from pymd.services.ui.table_dialog import TableDialog
-from pymd.utils.constants import MAX_RECENTS
+from pymd.services.ui.task_worker import TaskSignals, TaskWorker
+from pymd.utils.constants import (
+    ASYNC_READ_MIN_BYTES,
+    ASYNC_SAVE_MIN_CHARS,
+    EDITOR_CHUNKED_LOAD_MIN_CHARS,
+    EDITOR_LOAD_CHUNK_CHARS,
+    HTML_CACHE_SIZE,
+    MAX_RECENTS,
+    PREVIEW_LAZY_MIN_CHARS,
+    PREVIEW_SCHEME,
+)
+
+_BYTES = (bytes, bytearray)
+
+
+def _html_blocks_or_document(renderer: Any, text: str) -> list[str] | str:
+    """Worker-side render for the patching preview: block bodies, else a whole document."""
+    blocks = renderer.to_html_blocks(text)
+    return renderer.to_html(text) if blocks is None else blocks
+
+
+def _render_and_export(
+    renderer: Any, exporter: Any, text: str, html: str | None, out_path: Path
+) -> str:
+    """Worker-side export: render `text` unless its HTML is already known, then export."""
+    if html is None:
+        html = renderer.to_html(text)
+    exporter.export(html, out_path)
+    return html
+
+
+# File dialog name filters.
+_OPEN_FILTER = "Markdown (*.md *.markdown *.mdown);;Text (*.txt);;All files (*)"
+_SAVE_FILTER = "Markdown (*.md);;All files (*)"
+_IMAGE_FILTER = "PNG (*.png);;JPEG (*.jpeg *.jpg);;All files (*)"
+
+# Choices offered by "Insert code block"; "" inserts a fence without a language.
+_CODE_BLOCK_LANGS = (
+    "",
+    "php",
+    "javascript",
+    "typescript",
+    "java",
+    "c",
+    "cpp",
+    "csharp",
+    "python",
+    "ruby",
+    "scala",
+)
 
 # Plugin API is a stable contract; the concrete adapter stays inside the app.
 try:
@@ -51,7 +117,7 @@ class _QtAppAPI(IAppAPI):  # type: ignore[misc]
 
     # ---- document/text ops ----
     def get_current_text(self) -> str:
-        return self._w.editor.toPlainText()
+        return self._w._text()
 
     def set_current_text(self, text: str) -> None:
         self._w.editor.setPlainText(text)
@@ -96,6 +162,38 @@ class _QtAppAPI(IAppAPI):  # type: ignore[misc]
 class MainWindow(QMainWindow):
     """Thin PyQt window that delegates work to injected services (DIP)."""
 
+    # (name, label, handler method, handler args, shortcut) for the plain actions.
+    # Checkable toggles and per-exporter actions are built separately.
+    _ACTIONS: tuple[tuple[str, str, str, tuple[Any, ...], Any], ...] = (
+        ("plugins", "&Plugins…", "_show_plugins_manager", (), None),
+        ("new", "New", "_new_file", (), QKeySequence.StandardKey.New),
+        ("open", "Open…", "_open_dialog", (), QKeySequence.StandardKey.Open),
+        ("save", "Save", "_save", (), QKeySequence.StandardKey.Save),
+        ("save_as", "Save As…", "_save_as", (), QKeySequence.StandardKey.SaveAs),
+        ("about", "About…", "_show_about", (), None),
+        ("bold", "B", "_surround_selection", ("**", "**"), "Ctrl+B"),
+        ("italic", "i", "_surround_selection", ("_", "_"), "Ctrl+I"),
+        ("code", "`code`", "_insert_inline_code", (), None),
+        ("code_block", "codeblock", "_insert_code_block", (), None),
+        (
+            "code_block_simple",
+            "Insert Code Block",
+            "_insert_fenced_code_block_simple",
+            (),
+            "Ctrl+E",
+        ),
+        ("h1", "H1", "_toggle_header_prefix", ("# ",), None),
+        ("h2", "H2", "_toggle_header_prefix", ("## ",), None),
+        ("list", "List", "_prefix_line", ("- ",), None),
+        ("img", "Image", "_select_image", (), None),
+        ("link", "Link", "_create_link", (), None),
+        ("table", "Table", "_insert_table", (), "Ctrl+Shift+T"),
+        ("find", "Find", "_show_find", (), QKeySequence.StandardKey.Find),
+        ("find_next", "Find Next", "_find", (True,), QKeySequence.StandardKey.FindNext),
+        ("find_prev", "Find Previous", "_find", (False,), QKeySequence.StandardKey.FindPrevious),
+        ("replace", "Replace", "_show_replace", (), QKeySequence.StandardKey.Replace),
+    )
+
     def __init__(
         self,
         *,
@@ -123,6 +221,11 @@ class MainWindow(QMainWindow):
 
         self.doc = Document(path=None, text="", modified=False)
         self.recents: list[str] = self.settings.get_recent()
+        # Coalesces recents writes when several files are opened in quick succession.
+        self._recents_flush_timer = QTimer(self)
+        self._recents_flush_timer.setSingleShot(True)
+        self._recents_flush_timer.setInterval(500)
+        self._recents_flush_timer.timeout.connect(self._flush_recents)
 
         # Plugins (wired by container via attach_plugins)
         self._app_api = _QtAppAPI(self)
@@ -134,15 +237,108 @@ class MainWindow(QMainWindow):
         self._plugins_dialog_hooked: bool = False
 
         # Widgets
-        self.editor = QTextEdit(self)
-        self.editor.setAcceptRichText(False)
-        self.editor.setTabStopDistance(4 * self.editor.fontMetrics().horizontalAdvance(" "))
+        # QPlainTextEdit: plain text only, and its line-based layout scales to large files.
+        self.editor = QPlainTextEdit(self)
+        self._update_tab_stop()  # kept in step with the font via eventFilter (FontChange)
+        # Plain-text snapshot shared by render/save/export; dropped on every edit.
+        self._cached_text: str | None = None
+
+        # Chunked loading of large files (see _load_editor_text).
+        self._load_text = ""
+        self._load_pos = 0
+        self._load_timer = QTimer(self)
+        self._load_timer.setSingleShot(True)
+        self._load_timer.timeout.connect(self._append_load_chunk)
+        # Big files are read on the thread pool (see _open_path). A load into the editor
+        # bumps _read_job, so a read that finishes after New/another Open is dropped.
+        self._read_job = 0
+        self._reading: Path | None = None
+        self._read_signals = TaskSignals()
+        self._read_signals.done.connect(self._on_read_done, Qt.ConnectionType.QueuedConnection)
+        self._read_signals.failed.connect(self._on_read_failed, Qt.ConnectionType.QueuedConnection)
+        # Saves of big documents run on a one-thread pool, so writes land in order.
+        # _writes maps job id -> (path, text snapshot) until the worker reports back.
+        self._write_job = 0
+        self._writes: dict[int, tuple[Path, str]] = {}
+        self._write_pool = QThreadPool(self)
+        self._write_pool.setMaxThreadCount(1)
+        self._write_signals = TaskSignals()
+        self._write_signals.done.connect(self._on_write_done, Qt.ConnectionType.QueuedConnection)
+        self._write_signals.failed.connect(
+            self._on_write_failed, Qt.ConnectionType.QueuedConnection
+        )
+        # Exports by thread-safe exporters (render included) run on the pool:
+        # job id -> (format, path, text snapshot).
+        self._export_job = 0
+        self._exports: dict[int, tuple[str, str, str]] = {}
+        self._export_signals = TaskSignals()
+        self._export_signals.done.connect(self._on_export_done, Qt.ConnectionType.QueuedConnection)
+        self._export_signals.failed.connect(
+            self._on_export_failed, Qt.ConnectionType.QueuedConnection
+        )
 
         # Selection-aware UX shortcuts
         self.editor.installEventFilter(self)
 
-        # Preview: prefer QWebEngineView, fallback to QTextBrowser
-        self.preview = self._create_preview_widget()
+        # Preview: prefer QWebEngineView, fallback to QTextBrowser. Creating a
+        # QWebEngineView starts Chromium, so the splitter gets a cheap placeholder and the
+        # real widget is made by _ensure_preview_widget() once the window is on screen.
+        self.preview: Any = QWidget(self)
+        self._preview_ready = False
+
+        # Off-thread rendering: results carry a generation id so late (stale) renders
+        # never overwrite a newer preview. TaskSignals is deliberately unparented:
+        # in-flight workers keep it alive even if this window is destroyed first.
+        self._render_gen = 0
+        self._render_signals = TaskSignals()
+        # Queued even for same-thread emits, so cache hits are delivered like worker results.
+        self._render_signals.done.connect(self._on_render_done, Qt.ConnectionType.QueuedConnection)
+        self._render_signals.failed.connect(self._on_render_failed)
+        # (gen, render kind, source text) of the newest render, for caching its result.
+        self._render_input: tuple[int, str, str] = (0, "", "")
+
+        # Recent render results by (render kind, hash(text)); the full text is stored with
+        # each entry to rule out hash collisions. Undo/redo back to an earlier state and
+        # repeated exports of unchanged text don't render again. GUI thread only.
+        self._html_cache: OrderedDict[tuple[str, int], tuple[str, object]] = OrderedDict()
+
+        # Edits restart this timer, so the preview renders once typing pauses rather than
+        # on every keystroke. _last_rendered_text skips renders of unchanged text.
+        self._render_timer = QTimer(self)
+        self._render_timer.setSingleShot(True)
+        self._render_timer.setInterval(self.settings.get_preview_debounce_ms())
+        self._render_timer.timeout.connect(self._render_preview)
+        self._last_rendered_text: str | None = None
+
+        # Opt-in: let a QTextBrowser preview parse Markdown itself (setMarkdown, one C++
+        # pass) instead of going through the renderer and Qt's HTML parser. Qt's Markdown
+        # flavour lacks the renderer's extensions (math, TOC, admonitions, ...).
+        self._native_markdown = self.settings.get_native_markdown()
+
+        # Viewport-first preview for very large documents. QTextBrowser: the preview
+        # holds blocks [0, _lazy_shown) and grows as the user scrolls down. Patchable web
+        # preview: the first screenful is shown, then _lazy_rest (the whole text) is
+        # rendered and patched in straight away.
+        self._lazy_blocks: list[str] = []
+        self._lazy_shown = 0
+        self._lazy_rest = ""
+        self._keep_scroll_gen = 0
+        # Markdown block that was at the top of the preview when the last render started;
+        # restored via its blk-N anchor once the new HTML is in (QTextBrowser only).
+        self._scroll_block = 0
+        # Whether the HTML in the preview carries blk-N anchors (to_anchored_html falls back
+        # to plain to_html for some documents); without them there is nothing to look up.
+        self._preview_anchored = False
+
+        # WebEngine preview: once a page built from blocks_html() has loaded, later renders
+        # patch only the changed block <div>s via runJavaScript instead of calling setHtml
+        # (which reparses, re-runs MathJax and loses the scroll position).
+        # _dom_blocks mirrors the blocks currently in the page; None = no patchable page.
+        self._dom_blocks: list[str] | None = None
+        self._dom_loaded = False
+        # Newest blocks that arrived while that page was still loading (setHtml is
+        # asynchronous); patched in from _on_preview_loaded.
+        self._dom_pending: list[str] | None = None
 
         self.splitter = QSplitter(self)
         self.splitter.setOrientation(Qt.Orientation.Horizontal)
@@ -152,11 +348,11 @@ class MainWindow(QMainWindow):
         self.splitter.setStretchFactor(1, 1)
         self.setCentralWidget(self.splitter)
 
-        # Non-modal dialogs
-        self.about_dialog = AboutDialog(config=self.config, parent=self)
-        self.find_dialog = FindReplaceDialog(self.editor, self)
-        self.link_dialog = CreateLinkDialog(self.editor, self)
-        self.table_dialog = TableDialog(self.editor, self)
+        # Non-modal dialogs, built on first use (see the *_dialog properties)
+        self._about_dialog: AboutDialog | None = None
+        self._find_dialog: FindReplaceDialog | None = None
+        self._link_dialog: CreateLinkDialog | None = None
+        self._table_dialog: TableDialog | None = None
 
         # Signals
         self.editor.textChanged.connect(self._on_text_changed)
@@ -168,12 +364,16 @@ class MainWindow(QMainWindow):
         self.setStatusBar(QStatusBar(self))
 
         # Restore UI state
+        # restoreGeometry/restoreState accept bytes directly; no QByteArray copy needed.
         geo = self.settings.get_geometry()
-        if isinstance(geo, bytes | bytearray):
-            self.restoreGeometry(QByteArray(geo))
+        if isinstance(geo, _BYTES):
+            self.restoreGeometry(geo)
         split = self.settings.get_splitter()
-        if isinstance(split, bytes | bytearray):
-            self.splitter.restoreState(QByteArray(split))
+        if isinstance(split, _BYTES):
+            self.splitter.restoreState(split)
+        # Last persisted state; closeEvent only writes what differs from these.
+        self._last_geo_bytes = bytes(geo) if isinstance(geo, _BYTES) else None
+        self._last_split_bytes = bytes(split) if isinstance(split, _BYTES) else None
 
         # Load starting content
         if start_path:
@@ -216,20 +416,16 @@ class MainWindow(QMainWindow):
         self.exit_action.setStatusTip("Exit application")
         self.exit_action.triggered.connect(QApplication.instance().quit)  # type: ignore[union-attr]
 
-        self.act_plugins = QAction("&Plugins…", self, triggered=self._show_plugins_manager)
-
-        self.act_new = QAction(
-            "New", self, shortcut=QKeySequence.StandardKey.New, triggered=self._new_file
-        )
-        self.act_open = QAction(
-            "Open…", self, shortcut=QKeySequence.StandardKey.Open, triggered=self._open_dialog
-        )
-        self.act_save = QAction(
-            "Save", self, shortcut=QKeySequence.StandardKey.Save, triggered=self._save
-        )
-        self.act_save_as = QAction(
-            "Save As…", self, shortcut=QKeySequence.StandardKey.SaveAs, triggered=self._save_as
-        )
+        # Plain actions come from _ACTIONS; each is also exposed as `self.act_<name>`.
+        self._actions: dict[str, QAction] = {}
+        for name, label, method, args, shortcut in self._ACTIONS:
+            act = QAction(label, self)
+            if shortcut is not None:
+                act.setShortcut(QKeySequence(shortcut))
+            slot = getattr(self, method)
+            act.triggered.connect(partial(slot, *args) if args else slot)
+            self._actions[name] = act
+            setattr(self, f"act_{name}", act)
 
         self.act_toggle_wrap = QAction(
             "Toggle Wrap", self, checkable=True, checked=True, triggered=self._toggle_wrap
@@ -237,90 +433,70 @@ class MainWindow(QMainWindow):
         self.act_toggle_preview = QAction(
             "Toggle Preview", self, checkable=True, checked=True, triggered=self._toggle_preview
         )
+        self._actions["toggle_wrap"] = self.act_toggle_wrap
+        self._actions["toggle_preview"] = self.act_toggle_preview
 
-        self.act_about = QAction("About…", self, triggered=self._show_about)
-
+        # Per-exporter actions are created on first use; see _ensure_export_actions().
         self.export_actions: list[QAction] = []
-        for exporter in self._exporters.all():
-            act = QAction(
-                exporter.label, self, triggered=lambda chk=False, e=exporter: self._export_with(e)
-            )
-            self.export_actions.append(act)
+        self._exporters_loaded = False
+        self._export_menu = QMenu("Export", self)
+        self._export_menu.aboutToShow.connect(self._ensure_export_actions)
 
+        # Fixed pool of recent-file actions; _refresh_recent_menu only retitles/hides them,
+        # and only when the menu is about to show after self.recents changed.
         self.recent_menu = QMenu("Open Recent", self)
+        self.recent_menu.aboutToShow.connect(self._refresh_recent_menu)
+        self._recent_menu_stale = True
+        self._recent_empty = QAction("(empty)", self)
+        self._recent_empty.setEnabled(False)
+        self.recent_menu.addAction(self._recent_empty)
+        self._recent_actions: list[QAction] = []
+        for _ in range(MAX_RECENTS):
+            act = QAction(self)
+            act.setVisible(False)
+            act.triggered.connect(self._open_recent)
+            self.recent_menu.addAction(act)
+            self._recent_actions.append(act)
+
+    def _ensure_export_actions(self) -> None:
+        """Create one action per registered exporter, once, in the File and Export menus."""
+        if self._exporters_loaded:
+            return
+        self._exporters_loaded = True
+        for exporter in self._exporters.all():
+            act = QAction(exporter.label, self)
+            act.setData(exporter)
+            act.triggered.connect(self._on_export_triggered)
+            self.export_actions.append(act)
+        self._file_menu.insertActions(self._file_export_anchor, self.export_actions)
+        self._export_menu.addActions(self.export_actions)
 
-        self.act_bold = QAction("B", self, triggered=lambda: self._surround_selection("**", "**"))
-        self.act_bold.setShortcut("Ctrl+B")
-
-        self.act_italic = QAction("i", self, triggered=lambda: self._surround_selection("_", "_"))
-        self.act_italic.setShortcut("Ctrl+I")
-
-        self.act_code = QAction("`code`", self, triggered=self._insert_inline_code)
-        self.act_code_block = QAction("codeblock", self, triggered=self._insert_code_block)
-
-        self.act_code_block_simple = QAction(
-            "Insert Code Block",
-            self,
-            shortcut="Ctrl+E",
-            triggered=self._insert_fenced_code_block_simple,
-        )
-
-        self.act_h1 = QAction("H1", self, triggered=lambda: self._toggle_header_prefix("# "))
-        self.act_h2 = QAction("H2", self, triggered=lambda: self._toggle_header_prefix("## "))
-        self.act_list = QAction("List", self, triggered=lambda: self._prefix_line("- "))
-        self.act_img = QAction("Image", self, triggered=self._select_image)
-        self.act_link = QAction("Link", self, triggered=self._create_link)
-        self.act_table = QAction(
-            "Table", self, shortcut="Ctrl+Shift+T", triggered=self._insert_table
-        )
-
-        self.act_find = QAction("Find", self)
-        self.act_find.setShortcut(QKeySequence.StandardKey.Find)
-        self.act_find.triggered.connect(self._show_find)
-
-        self.act_find_next = QAction("Find Next", self)
-        self.act_find_next.setShortcut(QKeySequence.StandardKey.FindNext)
-        self.act_find_next.triggered.connect(lambda: self.find_dialog.find(forward=True))
-
-        self.act_find_prev = QAction("Find Previous", self)
-        self.act_find_prev.setShortcut(QKeySequence.StandardKey.FindPrevious)
-        self.act_find_prev.triggered.connect(lambda: self.find_dialog.find(forward=False))
-
-        self.act_replace = QAction("Replace", self)
-        self.act_replace.setShortcut(QKeySequence.StandardKey.Replace)
-        self.act_replace.triggered.connect(self._show_replace)
+    def _add_named_actions(self, target: QMenu | QToolBar, names: Iterable[str]) -> None:
+        for name in names:
+            target.addAction(self._actions[name])
 
     def _build_toolbar(self) -> None:
         tb = QToolBar("Main", self)
         tbf = QToolBar("Formatting", self)
         tb.setMovable(False)
 
-        for a in (self.act_new, self.act_open, self.act_save, self.act_save_as):
-            tb.addAction(a)
-        for a in self.export_actions:
-            tb.addAction(a)
+        self._add_named_actions(tb, ("new", "open", "save", "save_as"))
+        export_btn = QToolButton(tb)
+        export_btn.setText("Export")
+        export_btn.setMenu(self._export_menu)
+        export_btn.setPopupMode(QToolButton.ToolButtonPopupMode.InstantPopup)
+        tb.addWidget(export_btn)
         tb.addSeparator()
 
-        for a in (self.act_find, self.act_find_prev, self.act_find_next, self.act_replace):
-            tb.addAction(a)
+        self._add_named_actions(tb, ("find", "find_prev", "find_next", "replace"))
         tb.addSeparator()
 
-        tb.addAction(self.act_toggle_wrap)
-        tb.addAction(self.act_toggle_preview)
-
-        for a in (
-            self.act_bold,
-            self.act_italic,
-            self.act_code,
-            self.act_code_block,
-            self.act_h1,
-            self.act_h2,
-            self.act_list,
-            self.act_img,
-            self.act_link,
-            self.act_table,
-        ):
-            tbf.addAction(a)
+        self._add_named_actions(tb, ("toggle_wrap", "toggle_preview"))
+
+        self._add_named_actions(
+            tbf,
+            ("bold", "italic", "code", "code_block", "h1", "h2", "list", "img", "link", "table"),
+        )
 
         self.addToolBar(tb)
         self.addToolBarBreak()
@@ -330,38 +506,36 @@ class MainWindow(QMainWindow):
         m = self.menuBar()
 
         filem = m.addMenu("&File")
-        filem.addAction(self.act_new)
-        filem.addAction(self.act_open)
+        self._add_named_actions(filem, ("new", "open"))
         filem.addMenu(self.recent_menu)
         filem.addSeparator()
-        filem.addAction(self.act_save)
-        filem.addAction(self.act_save_as)
-        for a in self.export_actions:
-            filem.addAction(a)
-        filem.addSeparator()
+        self._add_named_actions(filem, ("save", "save_as"))
+        # Export entries are inserted above this separator the first time the menu opens.
+        self._file_export_anchor = filem.addSeparator()
         filem.addAction(self.exit_action)
-        self._refresh_recent_menu()
+        filem.aboutToShow.connect(self._ensure_export_actions)
+        self._file_menu = filem
 
         editm = m.addMenu("&Edit")
-        for a in (
-            self.act_bold,
-            self.act_italic,
-            self.act_code,
-            self.act_code_block,
-            self.act_code_block_simple,
-            self.act_h1,
-            self.act_h2,
-            self.act_list,
-            self.act_table,
-        ):
-            editm.addAction(a)
+        self._add_named_actions(
+            editm,
+            (
+                "bold",
+                "italic",
+                "code",
+                "code_block",
+                "code_block_simple",
+                "h1",
+                "h2",
+                "list",
+                "table",
+            ),
+        )
         editm.addSeparator()
-        for a in (self.act_find, self.act_find_prev, self.act_find_next, self.act_replace):
-            editm.addAction(a)
+        self._add_named_actions(editm, ("find", "find_prev", "find_next", "replace"))
 
         viewm = m.addMenu("&View")
-        viewm.addAction(self.act_toggle_wrap)
-        viewm.addAction(self.act_toggle_preview)
+        self._add_named_actions(viewm, ("toggle_wrap", "toggle_preview"))
 
         toolsm = m.addMenu("&Tools")
         toolsm.addAction(self.act_plugins)
@@ -372,16 +546,19 @@ class MainWindow(QMainWindow):
         helpm.addAction(self.act_about)
 
     def _refresh_recent_menu(self) -> None:
-        self.recent_menu.clear()
-        if not self.recents:
-            na = QAction("(empty)", self)
-            na.setEnabled(False)
-            self.recent_menu.addAction(na)
-            return
-        for p in self.recents[:MAX_RECENTS]:
-            self.recent_menu.addAction(
-                QAction(p, self, triggered=lambda chk=False, x=p: self._open_path(Path(x)))
-            )
+        if not self._recent_menu_stale:
+            return
+        self._recent_menu_stale = False
+        paths = self.recents[:MAX_RECENTS]
+        self._recent_empty.setVisible(not paths)
+        for i, act in enumerate(self._recent_actions):
+            if i < len(paths):
+                act.setText(paths[i])
+                act.setData(paths[i])
+            act.setVisible(i < len(paths))
+
+    def _open_recent(self) -> None:
+        self._open_path(Path(self.sender().data()))
 
     # ---------------------- UX: selection-aware shortcuts ----------------------
 
@@ -422,8 +599,15 @@ class MainWindow(QMainWindow):
                         return True
                     # else let default paste happen
 
+        elif obj is self.editor and event.type() == QEvent.Type.FontChange:  # type: ignore[attr-defined]
+            self._update_tab_stop()
+
         return super().eventFilter(obj, event)  # type: ignore[misc]
 
+    def _update_tab_stop(self) -> None:
+        # QFontMetricsF: fractional advance, so tabs line up with spaces at any zoom.
+        self.editor.setTabStopDistance(4 * QFontMetricsF(self.editor.font()).horizontalAdvance(" "))
+
     # ---------------------- UX: bold/italic toggles ----------------------
 
     def _surround_selection(self, left: str, right: str) -> None:
@@ -578,14 +762,9 @@ class MainWindow(QMainWindow):
         c = self.editor.textCursor()
         c.beginEditBlock()
         try:
-            if c.position() > 0:
-                original_pos = c.position()
-                c.movePosition(c.MoveOperation.Left, c.MoveMode.KeepAnchor, 1)
-                prev = c.selectedText()
-                c.clearSelection()
-                c.setPosition(original_pos)
-                if prev not in ("\u2029", "\n"):
-                    c.insertText("\n")
+            c.clearSelection()  # insert at the cursor, never over a selection
+            if not c.atBlockStart():
+                c.insertText("\n")
 
             c.insertText("```\n\n```\n")
             c.movePosition(c.MoveOperation.PreviousBlock)
@@ -698,6 +877,32 @@ class MainWindow(QMainWindow):
             self._plugins_menu.addAction(act)
             self._plugin_action_qactions.append(act)
 
+    # ----------------------------- Dialogs -----------------------------
+
+    @property
+    def about_dialog(self) -> AboutDialog:
+        if self._about_dialog is None:
+            self._about_dialog = AboutDialog(config=self.config, parent=self)
+        return self._about_dialog
+
+    @property
+    def find_dialog(self) -> FindReplaceDialog:
+        if self._find_dialog is None:
+            self._find_dialog = FindReplaceDialog(self.editor, self)
+        return self._find_dialog
+
+    @property
+    def link_dialog(self) -> CreateLinkDialog:
+        if self._link_dialog is None:
+            self._link_dialog = CreateLinkDialog(self.editor, self)
+        return self._link_dialog
+
+    @property
+    def table_dialog(self) -> TableDialog:
+        if self._table_dialog is None:
+            self._table_dialog = TableDialog(self.editor, self)
+        return self._table_dialog
+
     # ----------------------------- Actions -----------------------------
 
     def _show_about(self) -> None:
@@ -711,17 +916,23 @@ class MainWindow(QMainWindow):
     def _show_replace(self) -> None:
         self.find_dialog.show_replace()
 
+    def _find(self, forward: bool) -> None:
+        self.find_dialog.find(forward=forward)
+
     def _select_image(self) -> None:
         path_str, _ = QFileDialog.getOpenFileName(
             self,
             "Select image to add",
             "",
-            "PNG (*.png);;JPEG (*.jpeg *.jpg);;All files (*)",
+            _IMAGE_FILTER,
         )
         if not path_str:
             return
+        p = Path(path_str)
         c = self.editor.textCursor()
-        c.insertText(f'<img src="{path_str}" width="300" alt="Alt Text" />')
+        src = escape(p.as_posix(), quote=True)
+        alt = escape(p.name, quote=True)
+        c.insertText(f'<img src="{src}" width="300" alt="{alt}" />')
         self.editor.setTextCursor(c)
 
     def _create_link(self) -> None:
@@ -740,22 +951,8 @@ class MainWindow(QMainWindow):
         self.editor.setTextCursor(c)
 
     def _insert_code_block(self) -> None:
-        languages = [
-            "",
-            "php",
-            "javascript",
-            "typescript",
-            "java",
-            "c",
-            "cpp",
-            "csharp",
-            "python",
-            "ruby",
-            "scala",
-        ]
-
         lang, ok = QInputDialog.getItem(
-            self, "Code block language", "Select language (optional):", languages, 0, False
+            self, "Code block language", "Select language (optional):", _CODE_BLOCK_LANGS, 0, False
         )
         if not ok:
             return
@@ -766,14 +963,9 @@ class MainWindow(QMainWindow):
         c = self.editor.textCursor()
         c.beginEditBlock()
         try:
-            if c.position() > 0:
-                original_pos = c.position()
-                c.movePosition(c.MoveOperation.Left, c.MoveMode.KeepAnchor, 1)
-                prev = c.selectedText()
-                c.clearSelection()
-                c.setPosition(original_pos)
-                if prev not in ("\u2029", "\n"):
-                    c.insertText("\n")
+            c.clearSelection()  # insert at the cursor, never over a selection
+            if not c.atBlockStart():
+                c.insertText("\n")
 
             c.insertText(first_line + "\n\n```\n")
             c.movePosition(c.MoveOperation.PreviousBlock)
@@ -803,19 +995,24 @@ class MainWindow(QMainWindow):
         start_block = doc.findBlock(start)
         end_block = doc.findBlock(end_inclusive_pos)
 
-        cur = QTextCursor(start_block)
+        # Replace the covered lines in one insert (one undo step) instead of an
+        # insertText per line.
+        first = start_block.position()
+        cur = QTextCursor(doc)
+        cur.setPosition(first)
+        cur.setPosition(
+            end_block.position() + end_block.length() - 1, QTextCursor.MoveMode.KeepAnchor
+        )
+        text = cur.selectedText().replace("\u2029", "\n")
         cur.beginEditBlock()
         try:
-            block = start_block
-            while block.isValid():
-                cur.setPosition(block.position())
-                cur.insertText(prefix)
-                if block == end_block:
-                    break
-                block = block.next()
+            cur.insertText(prefix_each_line(text, prefix))
         finally:
             cur.endEditBlock()
 
+        # Document positions count UTF-16 units, not code points: take the end from Qt.
+        c.setPosition(first)
+        c.setPosition(cur.position(), QTextCursor.MoveMode.KeepAnchor)
         self.editor.setTextCursor(c)
 
     # ----------------------------- File ops -----------------------------
@@ -824,16 +1021,65 @@ class MainWindow(QMainWindow):
         if not self._confirm_discard():
             return
         self.doc = Document(path=None, text="", modified=False)
-        self.editor.setPlainText("")
+        self._load_editor_text("")
         self._update_title()
         self._render_preview()
 
+    def _load_editor_text(self, text: str) -> None:
+        # Blocked so textChanged doesn't mark the fresh document modified or start a
+        # render of its own; callers update the title and render exactly once.
+        self._load_timer.stop()
+        self._read_job += 1  # supersedes a read still in flight
+        # Results for the previous document won't be asked for again; free them.
+        self._html_cache.clear()
+        # The web preview's page is based on the old document's folder: load a new one.
+        self._dom_blocks = None
+        self._dom_pending = None
+        if self._reading is not None:
+            self._reading = None
+            self.statusBar().clearMessage()  # type: ignore[union-attr]
+        large = len(text) >= EDITOR_CHUNKED_LOAD_MIN_CHARS
+        with QSignalBlocker(self.editor):
+            self.editor.setPlainText(text[:EDITOR_LOAD_CHUNK_CHARS] if large else text)
+        if not large:
+            self._load_text = ""
+            self._cached_text = None
+            self.editor.setReadOnly(False)
+            self.editor.document().setUndoRedoEnabled(True)
+            return
+
+        # Large file: show the head now and append the rest one chunk per event-loop
+        # turn. The editor is read-only meanwhile, and the cache holds the whole text so
+        # render/save/export already see all of it.
+        self._load_text = text
+        self._load_pos = EDITOR_LOAD_CHUNK_CHARS
+        self._cached_text = text
+        self.editor.setReadOnly(True)
+        self.editor.document().setUndoRedoEnabled(False)
+        self._load_timer.start(0)
+
+    def _append_load_chunk(self) -> None:
+        text, pos = self._load_text, self._load_pos
+        end = pos + EDITOR_LOAD_CHUNK_CHARS
+        cur = QTextCursor(self.editor.document())
+        cur.movePosition(QTextCursor.MoveOperation.End)
+        with QSignalBlocker(self.editor):
+            cur.insertText(text[pos:end])
+        if end < len(text):
+            self._load_pos = end
+            self._load_timer.start(0)
+            return
+        self._load_text = ""
+        self._cached_text = None
+        self.editor.document().setUndoRedoEnabled(True)
+        self.editor.setReadOnly(False)
+
     def _open_dialog(self) -> None:
         path_str, _ = QFileDialog.getOpenFileName(
             self,
             "Open Markdown",
             "",
-            "Markdown (*.md *.markdown *.mdown);;Text (*.txt);;All files (*)",
+            _OPEN_FILTER,
         )
         if path_str:
             self._open_path(Path(path_str))
@@ -841,13 +1087,48 @@ class MainWindow(QMainWindow):
     def _open_path(self, path: Path) -> None:
         if not self._confirm_discard():
             return
+        try:
+            size = path.stat().st_size
+        except OSError:
+            size = 0  # let read_text() report the problem
+        if size >= ASYNC_READ_MIN_BYTES:
+            self._start_read(path)
+            return
         try:
             text = self.file_service.read_text(path)
         except Exception as e:
-            QMessageBox.critical(self, "Open Error", f"Failed to open file:\n{e}")
+            self._on_read_failed(self._read_job, str(e))
+            return
+        self._finish_open(path, text)
+
+    def _start_read(self, path: Path) -> None:
+        # The editor is about to be replaced, so it stays read-only until the text arrives.
+        self._read_job += 1
+        self._reading = path
+        self.editor.setReadOnly(True)
+        self.statusBar().showMessage(f"Opening {path.name}…")  # type: ignore[union-attr]
+        task = partial(self.file_service.read_text, path)
+        QThreadPool.globalInstance().start(TaskWorker(task, self._read_job, self._read_signals))  # type: ignore[union-attr]
+
+    def _on_read_done(self, job: int, text: object) -> None:
+        if job != self._read_job or self._reading is None:
+            return  # superseded by New or another Open
+        path, self._reading = self._reading, None
+        self.statusBar().clearMessage()  # type: ignore[union-attr]
+        self._finish_open(path, str(text))
+
+    def _on_read_failed(self, job: int, message: str) -> None:
+        if job != self._read_job:
             return
+        if self._reading is not None:
+            self._reading = None
+            self.editor.setReadOnly(False)
+            self.statusBar().clearMessage()  # type: ignore[union-attr]
+        QMessageBox.critical(self, "Open Error", f"Failed to open file:\n{message}")
+
+    def _finish_open(self, path: Path, text: str) -> None:
         self.doc = Document(path=path, text=text, modified=False)
-        self.editor.setPlainText(text)
+        self._load_editor_text(text)
         self._update_title()
         self._render_preview()
         self._add_recent(path)
@@ -856,13 +1137,45 @@ class MainWindow(QMainWindow):
         if self.doc.path is None:
             self._save_as()
             return
-        self._write_to(self.doc.path)
+        text = self._text()
+        if len(text) >= ASYNC_SAVE_MIN_CHARS:
+            self._start_write(self.doc.path, text)
+        else:
+            self._write_to(self.doc.path)
+
+    def _start_write(self, path: Path, text: str) -> None:
+        # Editing stays enabled. The modified flag is only cleared if the text is still
+        # the snapshot that was written: _cached_text is dropped on every edit.
+        self._write_job += 1
+        self._writes[self._write_job] = (path, text)
+        self.statusBar().showMessage(f"Saving {path.name}…")  # type: ignore[union-attr]
+        task = partial(self.file_service.write_text_atomic, path, text)
+        self._write_pool.start(TaskWorker(task, self._write_job, self._write_signals))
+
+    def _on_write_done(self, job: int, _result: object) -> None:
+        path, text = self._writes.pop(job)
+        if self._cached_text is text and self.doc.path == path:
+            self.doc.modified = False
+            self._update_title()
+        self.statusBar().showMessage(f"Saved: {path}", 3000)  # type: ignore[union-attr]
+
+    def _on_write_failed(self, job: int, message: str) -> None:
+        self._writes.pop(job, None)
+        self.statusBar().clearMessage()  # type: ignore[union-attr]
+        QMessageBox.critical(self, "Save Error", f"Failed to save file:\n{message}")
+
+    def _finish_writes(self) -> None:
+        """Wait for background saves and apply their results (modified flag, errors) now."""
+        if not self._writes:
+            return
+        self._write_pool.waitForDone()
+        # Their done/failed calls are queued (PyQt routes them through its own slot
+        # proxies, not this window), so deliver every pending queued call now.
+        QCoreApplication.sendPostedEvents(None, QEvent.Type.MetaCall.value)
 
     def _save_as(self) -> None:
         start = str(self.doc.path) if self.doc.path else ""
-        path_str, _ = QFileDialog.getSaveFileName(
-            self, "Save As", start, "Markdown (*.md);;All files (*)"
-        )
+        path_str, _ = QFileDialog.getSaveFileName(self, "Save As", start, _SAVE_FILTER)
         if not path_str:
             return
         path = Path(path_str)
@@ -873,7 +1186,7 @@ class MainWindow(QMainWindow):
 
     def _write_to(self, path: Path) -> bool:
         try:
-            self.file_service.write_text_atomic(path, self.editor.toPlainText())
+            self.file_service.write_text_atomic(path, self._text())
             self.doc.modified = False
             self._update_title()
             self.statusBar().showMessage(f"Saved: {path}", 3000)  # type: ignore[union-attr]
@@ -882,6 +1195,9 @@ class MainWindow(QMainWindow):
             QMessageBox.critical(self, "Save Error", f"Failed to save file:\n{e}")
             return False
 
+    def _on_export_triggered(self) -> None:
+        self._export_with(self.sender().data())
+
     def _export_with(self, exporter: Any) -> None:
         default = (
             self.doc.path.with_suffix(f".{exporter.file_ext}").name
@@ -892,32 +1208,315 @@ class MainWindow(QMainWindow):
         out_str, _ = QFileDialog.getSaveFileName(self, exporter.label, default, filt)
         if not out_str:
             return
-        html = self.renderer.to_html(self.editor.toPlainText())
+        text = self._text()
+        fmt = exporter.name.upper()
+        if getattr(exporter, "thread_safe", False):
+            # Render (on a cache miss) and export both on the pool.
+            self._export_job += 1
+            self._exports[self._export_job] = (fmt, out_str, text)
+            self.statusBar().showMessage(f"Exporting {fmt}…")  # type: ignore[union-attr]
+            task = partial(
+                _render_and_export,
+                self.renderer,
+                exporter,
+                text,
+                self._cached_html(text),
+                Path(out_str),
+            )
+            QThreadPool.globalInstance().start(  # type: ignore[union-attr]
+                TaskWorker(task, self._export_job, self._export_signals)
+            )
+            return
         try:
-            exporter.export(html, Path(out_str))
-            self.statusBar().showMessage(f"Exported {exporter.name.upper()}: {out_str}", 3000)  # type: ignore[union-attr]
+            exporter.export(self._to_html(text), Path(out_str))
+            self.statusBar().showMessage(f"Exported {fmt}: {out_str}", 3000)  # type: ignore[union-attr]
         except Exception as e:
-            QMessageBox.critical(
-                self, "Export Error", f"Failed to export {exporter.name.upper()}:\n{e}"
-            )
+            QMessageBox.critical(self, "Export Error", f"Failed to export {fmt}:\n{e}")
+
+    def _on_export_done(self, job: int, html: object) -> None:
+        fmt, out_str, text = self._exports.pop(job)
+        self._cache_put("html", text, html)
+        self.statusBar().showMessage(f"Exported {fmt}: {out_str}", 3000)  # type: ignore[union-attr]
+
+    def _on_export_failed(self, job: int, message: str) -> None:
+        fmt, _, _ = self._exports.pop(job)
+        self.statusBar().clearMessage()  # type: ignore[union-attr]
+        QMessageBox.critical(self, "Export Error", f"Failed to export {fmt}:\n{message}")
 
     def _toggle_wrap(self, on: bool) -> None:
-        mode = QTextEdit.LineWrapMode.WidgetWidth if on else QTextEdit.LineWrapMode.NoWrap
+        mode = QPlainTextEdit.LineWrapMode.WidgetWidth if on else QPlainTextEdit.LineWrapMode.NoWrap
         self.editor.setLineWrapMode(mode)
 
     def _toggle_preview(self, on: bool) -> None:
         self.preview.setVisible(on)
+        if on:
+            self._render_preview()  # no-op unless the text changed while hidden
+        else:
+            self._render_timer.stop()
 
     # ----------------------------- Helpers -----------------------------
 
     def _render_preview(self) -> None:
-        html = self.renderer.to_html(self.editor.toPlainText())
-        self.preview.setHtml(html)  # type: ignore[attr-defined]
+        # A hidden preview doesn't need Markdown parsing or setHtml; render once on re-show.
+        # isHidden() (not isVisible()) so an unshown window still renders its initial content.
+        if self.preview.isHidden():
+            return
+        if not self._preview_ready:
+            if not self.isVisible():
+                return  # showEvent renders once the window is up
+            self._ensure_preview_widget()
+        self._render_timer.stop()  # an explicit render supersedes a pending debounced one
+        text = self._text()
+        if text == self._last_rendered_text:
+            return
+        self._last_rendered_text = text
+        if self._native_markdown and isinstance(self.preview, QTextBrowser):
+            self._render_gen += 1  # drop any HTML render still in flight
+            self._show_markdown(text)
+            return
+        self._scroll_block = self._top_block_index()
+        self._start_render(self._lazy_head(text))
+
+    def _show_markdown(self, text: str) -> None:
+        self._preview_anchored = False
+        sb = self.preview.verticalScrollBar()
+        pos = sb.value()
+        self.preview.setMarkdown(text)
+        sb.setValue(pos)
+
+    def _start_render(self, text: str) -> int:
+        self._render_gen += 1
+        kind, render = self._preview_render_fn()
+        self._render_input = (self._render_gen, kind, text)
+        cached = self._cache_get(kind, text)
+        if cached is not None:
+            self._render_signals.done.emit(self._render_gen, cached)
+            return self._render_gen
+        worker = TaskWorker(partial(render, text), self._render_gen, self._render_signals)
+        QThreadPool.globalInstance().start(worker)  # type: ignore[union-attr]
+        return self._render_gen
+
+    def _preview_render_fn(self) -> tuple[str, Callable[[str], object]]:
+        """(cache kind, worker-safe render callable) suited to the current preview widget."""
+        if isinstance(self.preview, QTextBrowser):
+            # Renderers offering to_anchored_html() let the preview keep its place by block.
+            if hasattr(self.renderer, "to_anchored_html"):
+                return "anchored", self.renderer.to_anchored_html
+        elif hasattr(self.renderer, "to_html_blocks"):
+            return "blocks", partial(_html_blocks_or_document, self.renderer)
+        return "html", self.renderer.to_html
+
+    def _to_html(self, text: str) -> str:
+        """renderer.to_html(text), served from the render cache when possible."""
+        html = self._cached_html(text)
+        if html is None:
+            html = self.renderer.to_html(text)
+            self._cache_put("html", text, html)
+        return html
+
+    def _cached_html(self, text: str) -> str | None:
+        """to_html(text) from the cache: an earlier export, or the web preview's blocks."""
+        html = self._cache_get("html", text)
+        if isinstance(html, str):
+            return html
+        blocks = self._cache_get("blocks", text)
+        if isinstance(blocks, list):
+            # The blocks add up to to_html()'s body (see MarkdownRenderer.to_html_blocks).
+            html = self.renderer.to_document("\n".join(blocks))
+        elif isinstance(blocks, str):
+            html = blocks  # the preview render fell back to the whole document
+        else:
+            return None
+        self._cache_put("html", text, html)
+        return html
+
+    def _cache_get(self, kind: str, text: str) -> object | None:
+        key = (kind, hash(text))
+        hit = self._html_cache.get(key)
+        if hit is None or hit[0] != text:
+            return None
+        self._html_cache.move_to_end(key)
+        return hit[1]
+
+    def _cache_put(self, kind: str, text: str, result: object) -> None:
+        key = (kind, hash(text))
+        self._html_cache[key] = (text, result)
+        self._html_cache.move_to_end(key)
+        while len(self._html_cache) > HTML_CACHE_SIZE:
+            self._html_cache.popitem(last=False)
+
+    def _on_render_done(self, gen: int, html: object) -> None:
+        if gen != self._render_gen:
+            return  # superseded by a newer render
+        _, kind, text = self._render_input
+        self._cache_put(kind, text, html)
+        if isinstance(html, list):
+            self._show_html_blocks(html)
+            self._render_lazy_rest()
+            return
+        self._dom_blocks = None
+        self._dom_pending = None
+        self._preview_anchored = (
+            isinstance(html, str) and f'<a name="{BLOCK_ANCHOR_PREFIX}0">' in html
+        )
+        if gen == self._keep_scroll_gen:
+            # Lazy growth: the already-visible part is unchanged, so keep the pixel offset.
+            self._keep_scroll_gen = 0
+            sb = self.preview.verticalScrollBar()
+            pos = sb.value()
+            self._set_preview_html(html)
+            sb.setValue(pos)
+            return
+        self._set_preview_html(html)
+        if self._scroll_block and isinstance(self.preview, QTextBrowser):
+            self.preview.scrollToAnchor(f"{BLOCK_ANCHOR_PREFIX}{self._scroll_block}")
+        # The head may come back as a whole document (e.g. repeated headings): still
+        # follow up with the rest.
+        self._render_lazy_rest()
+
+    def _render_lazy_rest(self) -> None:
+        if self._lazy_rest:
+            rest, self._lazy_rest = self._lazy_rest, ""
+            self._start_render(rest)
+
+    def _show_html_blocks(self, blocks: list[str]) -> None:
+        if self._dom_blocks is not None and not self._dom_loaded:
+            # A patchable page (e.g. the warm-up page) is still loading: patch once it's in.
+            self._dom_pending = blocks
+            return
+        old = self._dom_blocks
+        self._dom_blocks = blocks
+        if old is None:
+            # No patchable page yet: load one.
+            self._dom_loaded = False
+            self._set_preview_html(self.renderer.to_document(blocks_html(blocks)))
+            return
+        edit = diff_blocks(old, blocks)
+        if edit is not None:
+            self.preview.page().runJavaScript(patch_script(*edit), self._on_preview_patched)
+
+    def _set_preview_html(self, html: str) -> None:
+        """setHtml() with the document's folder as base URL, so relative images resolve."""
+        base = QUrl.fromLocalFile(f"{self._preview_folder()}/")
+        if isinstance(self.preview, QTextBrowser):
+            self.preview.document().setBaseUrl(base)  # type: ignore[union-attr]
+            self.preview.setHtml(html)
+        else:
+            # Not file://: scripts in the page must not read local files. DocSchemeHandler
+            # serves the images under the folder instead.
+            base.setScheme(PREVIEW_SCHEME)
+            self.preview.setHtml(html, base)  # type: ignore[attr-defined]
+
+    def _preview_folder(self) -> Path:
+        return self.doc.path.parent if self.doc.path else Path.cwd()
+
+    def _on_preview_loaded(self, ok: bool) -> None:
+        self._dom_loaded = ok
+        if not ok:
+            self._dom_blocks = None  # nothing to patch: the next blocks load a full page
+        pending, self._dom_pending = self._dom_pending, None
+        if pending is not None:
+            self._show_html_blocks(pending)
+
+    def _on_preview_patched(self, ok: object) -> None:
+        if ok is not True:
+            # The page no longer holds our blocks (navigated away?): reload it fully.
+            self._dom_blocks = None
+            self._last_rendered_text = None
+            self._render_preview()
+
+    def _top_block_index(self) -> int:
+        """Index of the Markdown block shown at the top of the preview (0 if unknown)."""
+        if not self._preview_anchored or not isinstance(self.preview, QTextBrowser):
+            return 0
+        block = self.preview.cursorForPosition(QPoint(0, 0)).block()
+        while block.isValid():
+            # Qt keeps an empty <a name> either on the block or on its first fragment.
+            names = list(block.charFormat().anchorNames())
+            it = block.begin()
+            while not it.atEnd():
+                names += it.fragment().charFormat().anchorNames()
+                it += 1
+            for name in reversed(names):
+                if name.startswith(BLOCK_ANCHOR_PREFIX):
+                    return int(name[len(BLOCK_ANCHOR_PREFIX) :])
+            block = block.previous()
+        return 0
+
+    def _lazy_head(self, text: str) -> str:
+        """
+        For huge documents, return only the leading blocks that fill about three
+        viewports. A QTextBrowser gets the rest as the user scrolls towards it; the
+        block-patching web preview gets it in a second render right after the first,
+        but only while its page is empty: later renders diff against the whole page.
+        """
+        self._lazy_blocks = []
+        self._lazy_rest = ""
+        self._keep_scroll_gen = 0
+        browser = isinstance(self.preview, QTextBrowser)
+        if (
+            len(text) < PREVIEW_LAZY_MIN_CHARS
+            or not (browser or self._preview_render_fn()[0] == "blocks")
+            or (not browser and self._dom_blocks)
+            or has_document_scope(text)
+        ):
+            return text
+        blocks = split_blocks(text)
+        # Cover the block the reader is at, so the anchor exists after the render.
+        n = self._viewport_block_budget(blocks, self._scroll_block if browser else 0)
+        if n >= len(blocks):
+            return text
+        if not browser:
+            self._lazy_rest = text
+            return "\n\n".join(blocks[:n])
+        self._lazy_blocks = blocks
+        self._lazy_shown = n
+        return "\n\n".join(blocks[:n])
+
+    def _viewport_block_budget(self, blocks: list[str], start: int) -> int:
+        """Index just past the blocks (from `start`) that fill ~3 preview viewports."""
+        line_h = max(1, self.preview.fontMetrics().lineSpacing())
+        view = self.preview.viewport() if isinstance(self.preview, QTextBrowser) else self.preview
+        budget = max(1, 3 * view.height() // line_h)
+        lines = 0
+        i = start
+        while i < len(blocks) and lines < budget:
+            lines += blocks[i].count("\n") + 2
+            i += 1
+        return i
+
+    def _on_preview_scrolled(self, value: int) -> None:
+        if not self._lazy_blocks or self._keep_scroll_gen:
+            return  # nothing deferred, or a growth render is already in flight
+        sb = self.preview.verticalScrollBar()
+        if value < sb.maximum() - sb.pageStep():
+            return
+        blocks = self._lazy_blocks
+        self._lazy_shown = self._viewport_block_budget(blocks, self._lazy_shown)
+        head = "\n\n".join(blocks[: self._lazy_shown])
+        if self._lazy_shown >= len(blocks):
+            self._lazy_blocks = []
+        self._keep_scroll_gen = self._start_render(head)
+
+    def _on_render_failed(self, gen: int, message: str) -> None:
+        if gen != self._render_gen:
+            return
+        self.statusBar().showMessage(f"Preview error: {message}", 5000)  # type: ignore[union-attr]
+
+    def _text(self) -> str:
+        """Editor contents, copied out of the QTextDocument at most once per edit."""
+        if self._cached_text is None:
+            self._cached_text = self.editor.toPlainText()
+        return self._cached_text
 
     def _on_text_changed(self) -> None:
-        self.doc.modified = True
-        self._update_title()
-        self._render_preview()
+        self._cached_text = None
+        # Only the first edit flips the flag; the title doesn't change after that.
+        if not self.doc.modified:
+            self.doc.modified = True
+            self._update_title()
+        if not self.preview.isHidden():  # a hidden preview catches up in _toggle_preview
+            self._render_timer.start()
 
     def _update_title(self) -> None:
         name = self.doc.path.name if self.doc.path else "Untitled"
@@ -925,6 +1524,7 @@ class MainWindow(QMainWindow):
         self.setWindowTitle(f"{name}{star} — Markdown Editor")
 
     def _confirm_discard(self) -> bool:
+        self._finish_writes()  # text that is being saved is not "unsaved"
         if not self.doc.modified:
             return True
         resp = QMessageBox.question(
@@ -937,12 +1537,15 @@ class MainWindow(QMainWindow):
 
     def _add_recent(self, path: Path) -> None:
         s = str(path)
-        if s in self.recents:
-            self.recents.remove(s)
-        self.recents.insert(0, s)
-        self.recents = self.recents[:MAX_RECENTS]
+        if self.recents[:1] == [s]:
+            return  # already most recent: no settings write, no menu rebuild
+        new = list(dict.fromkeys([s, *self.recents]))[:MAX_RECENTS]
+        self.recents = new
+        self._recent_menu_stale = True
+        self._recents_flush_timer.start()
+
+    def _flush_recents(self) -> None:
         self.settings.set_recent(self.recents)
-        self._refresh_recent_menu()
 
     # ----------------------------- DnD -----------------------------
 
@@ -961,12 +1564,57 @@ class MainWindow(QMainWindow):
     # ----------------------------- Close -----------------------------
 
     def closeEvent(self, event: Any) -> None:
-        self.settings.set_geometry(bytes(self.saveGeometry()))
-        self.settings.set_splitter(bytes(self.splitter.saveState()))
+        geo = bytes(self.saveGeometry())
+        split = bytes(self.splitter.saveState())
+        recents_pending = self._recents_flush_timer.isActive()
+        self._recents_flush_timer.stop()
+        if geo == self._last_geo_bytes:
+            geo = None
+        if split == self._last_split_bytes:
+            split = None
+        if geo is not None or split is not None or recents_pending:
+            self.settings.save_all(
+                geometry=geo,
+                splitter=split,
+                recents=self.recents if recents_pending else None,
+            )
+            self._last_geo_bytes = geo or self._last_geo_bytes
+            self._last_split_bytes = split or self._last_split_bytes
+        self._finish_writes()  # a save started just before quitting must reach the disk
         super().closeEvent(event)
 
     # ---------------------- Internal: preview creation ----------------------
 
+    def showEvent(self, event: Any) -> None:
+        super().showEvent(event)
+        if not self._preview_ready:
+            # After the first paint, so the preview's startup cost isn't on the way there.
+            QTimer.singleShot(0, self._render_preview)
+
+    def _ensure_preview_widget(self) -> None:
+        """Replace the startup placeholder with the real preview widget (once)."""
+        if self._preview_ready:
+            return
+        self._preview_ready = True
+        placeholder = self.preview
+        shown = not placeholder.isHidden()  # replaceWidget() hides the old widget
+        w = self._create_preview_widget()
+        self.splitter.replaceWidget(self.splitter.indexOf(placeholder), w)
+        w.setVisible(shown)
+        placeholder.deleteLater()
+        self.preview = w
+
+        if isinstance(w, QTextBrowser):
+            w.verticalScrollBar().valueChanged.connect(self._on_preview_scrolled)
+        if hasattr(w, "loadFinished"):
+            w.loadFinished.connect(self._on_preview_loaded)
+            if hasattr(self.renderer, "to_html_blocks"):
+                # Load an empty patchable page now: the web renderer starts up while the
+                # first Markdown render runs on the pool; its result waits for the page
+                # (see _show_html_blocks) and is then patched in.
+                self._dom_blocks = []
+                self._set_preview_html(self.renderer.to_document(blocks_html([])))
+
     def _create_preview_widget(self) -> Any:
         disable_webengine = (
             os.environ.get("PYMD_DISABLE_WEBENGINE", "").strip() == "1"
@@ -979,9 +1627,20 @@ class MainWindow(QMainWindow):
             return w
 
         try:
+            from PyQt6.QtWebEngineCore import QWebEnginePage, QWebEngineProfile  # type: ignore
             from PyQt6.QtWebEngineWidgets import QWebEngineView  # type: ignore
 
-            return QWebEngineView(self)
+            from pymd.services.ui.doc_scheme import DocSchemeHandler
+
+            view = QWebEngineView(self)
+            # A profile per window, so its scheme handler serves this window's document.
+            # Parented after the view: the page must be gone before its profile is.
+            profile = QWebEngineProfile(self)
+            profile.installUrlSchemeHandler(
+                PREVIEW_SCHEME.encode(), DocSchemeHandler(self._preview_folder, profile)
+            )
+            view.setPage(QWebEnginePage(profile, view))
+            return view
         except Exception:
             w = QTextBrowser(self)
             w.setOpenExternalLinks(True)
@@ -1001,7 +1660,7 @@ class MainWindow(QMainWindow):
             self.setStyleSheet(
                 """
                 QMainWindow { background: #1e1e1e; }
-                QTextEdit { background: #111; color: #e6e6e6; border: 1px solid #333; }
+                QPlainTextEdit { background: #111; color: #e6e6e6; border: 1px solid #333; }
                 QTextBrowser { background: #111; color: #e6e6e6; border: 1px solid #333; }
                 QMenuBar, QMenu { background: #1e1e1e; color: #e6e6e6; }
                 QToolBar { background: #1e1e1e; border: none; }
@@ -1013,7 +1672,7 @@ class MainWindow(QMainWindow):
             self.setStyleSheet(
                 """
                 QMainWindow { background: #fafafa; }
-                QTextEdit { background: #ffffff; color: #111; border: 1px solid #ddd; }
+                QPlainTextEdit { background: #ffffff; color: #111; border: 1px solid #ddd; }
                 QTextBrowser { background: #ffffff; color: #111; border: 1px solid #ddd; }
                 QMenuBar, QMenu { background: #fafafa; color: #111; }
                 QToolBar { background: #fafafa; border: none; }
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import json
+
+from pymd.utils.constants import RETYPESET_HOOK
+
+# Id of the element that holds one <div> per Markdown block in a patchable preview page.
+ROOT_ID = "pymd-root"
+
+# Replace `delete` block divs at `start` with the given HTML, then hand the new and the
+# removed nodes to the math engine's RETYPESET_HOOK, if the page defines one. Evaluates to
+# false when the page has no root (e.g. after a link click navigated away), so the caller
+# can fall back to a full reload.
+_PATCH_JS = """
+(function () {
+  var root = document.getElementById(%(root)s);
+  if (!root) return false;
+  var removed = Array.prototype.slice.call(root.children, %(start)d, %(start)d + %(delete)d);
+  removed.forEach(function (n) { root.removeChild(n); });
+  var t = document.createElement("template");
+  t.innerHTML = %(html)s;
+  var added = Array.prototype.slice.call(t.content.children);
+  root.insertBefore(t.content, root.children[%(start)d] || null);
+  var retypeset = window[%(hook)s];
+  if (typeof retypeset === "function") retypeset(added, removed);
+  return true;
+})();
+"""
+
+
+def diff_blocks(old: list[str], new: list[str]) -> tuple[int, int, list[str]] | None:
+    """
+    Smallest single contiguous edit turning `old` into `new`, as
+    (start, number of blocks to delete, blocks to insert). None if they are equal.
+    """
+    if old == new:
+        return None
+    n = min(len(old), len(new))
+    start = 0
+    while start < n and old[start] == new[start]:
+        start += 1
+    tail = 0
+    while tail < n - start and old[-1 - tail] == new[-1 - tail]:
+        tail += 1
+    return start, len(old) - start - tail, new[start : len(new) - tail]
+
+
+def blocks_html(blocks: list[str]) -> str:
+    """Body markup for a patchable page: each block in its own <div> under ROOT_ID."""
+    return f'<div id="{ROOT_ID}">{_divs(blocks)}</div>'
+
+
+def patch_script(start: int, delete: int, insert: list[str]) -> str:
+    """JavaScript applying a diff_blocks() edit to a page built from blocks_html()."""
+    return _PATCH_JS % {
+        "root": json.dumps(ROOT_ID),
+        "start": start,
+        "delete": delete,
+        "html": json.dumps(_divs(insert)),
+        "hook": json.dumps(RETYPESET_HOOK),
+    }
+
+
+def _divs(blocks: list[str]) -> str:
+    return "".join(f"<div>{b}</div>" for b in blocks)
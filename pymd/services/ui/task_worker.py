@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+
+class TaskSignals(QObject):
+    """
+    Result channel for TaskWorker.
+
+    Each window creates one unparented instance per kind of job (render, read, save,
+    export) and connects it once; workers hold a reference, emit from the pool thread,
+    and Qt queues delivery onto the GUI thread.
+    """
+
+    done = pyqtSignal(int, object)  # job id, whatever `task` returned
+    failed = pyqtSignal(int, str)  # job id, error message
+
+
+class TaskWorker(QRunnable):
+    """
+    Run `task` (a Markdown render, file read, atomic write or export) on a QThreadPool
+    thread and report its result under `job`, which lets the window drop stale results.
+
+    `task` gets everything it needs up front (e.g. partial(render, text)) and must be
+    safe off the GUI thread: it must not touch widgets. MarkdownRenderer qualifies, as
+    each call builds its own markdown.Markdown instance.
+    """
+
+    def __init__(self, task: Callable[[], object], job: int, signals: TaskSignals) -> None:
+        super().__init__()
+        self._task = task
+        self._job = job
+        self._signals = signals
+
+    def run(self) -> None:
+        # Nothing may escape run(): PyQt treats an unhandled exception in a virtual
+        # called from C++ as fatal.
+        try:
+            result = self._task()
+        except Exception as e:
+            self._emit("failed", str(e))
+            return
+        self._emit("done", result)
+
+    def _emit(self, name: str, payload: object) -> None:
+        try:
+            getattr(self._signals, name).emit(self._job, payload)
+        except RuntimeError:
+            # TaskSignals was torn down while the task ran (e.g. app shutdown).
+            pass
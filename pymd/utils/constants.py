@@ -51,4 +51,35 @@ HTML_TEMPLATE = """<!doctype html>
 SETTINGS_GEOMETRY = "window/geometry"
 SETTINGS_SPLITTER = "window/splitter"
 SETTINGS_RECENTS = "file/recent"
+SETTINGS_PREVIEW_DEBOUNCE = "render/debounce_ms"
+SETTINGS_NATIVE_MARKDOWN = "render/native_markdown"
 MAX_RECENTS = 8
+
+# Pause in typing (ms) before the preview re-renders; overridable via render/debounce_ms.
+PREVIEW_DEBOUNCE_MS = 200
+
+# Global JS function (added, removed) the math assets define so a patched preview page can
+# re-typeset new block nodes and release removed ones (see services/ui/preview_patch.py).
+RETYPESET_HOOK = "pymdRetypeset"
+
+# URL scheme the WebEngine preview page is loaded under (see services/ui/doc_scheme.py).
+PREVIEW_SCHEME = "pymd-doc"
+
+# Documents at least this long get a viewport-first (lazy) QTextBrowser preview.
+PREVIEW_LAZY_MIN_CHARS = 200_000
+
+# Files at least this big (bytes) are read on a worker thread instead of the GUI thread.
+ASYNC_READ_MIN_BYTES = 1_000_000
+# Documents at least this long are saved (Ctrl+S) on a worker thread.
+ASYNC_SAVE_MIN_CHARS = 1_000_000
+
+# Files longer than this are loaded into the editor in EDITOR_LOAD_CHUNK_CHARS slices,
+# one per event-loop turn, so the window paints before the whole text is laid out.
+EDITOR_CHUNKED_LOAD_MIN_CHARS = 1_000_000
+EDITOR_LOAD_CHUNK_CHARS = 200_000
+
+# Rendered top-level Markdown blocks kept by MarkdownRenderer (LRU, by block source).
+BLOCK_CACHE_SIZE = 4096
+
+# Rendered-HTML results kept per window (LRU); entries hold whole documents, keep it small.
+HTML_CACHE_SIZE = 16
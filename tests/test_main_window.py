@@ -1,21 +1,26 @@
 # tests/test_main_window.py
 from __future__ import annotations
 
+import re
+from collections.abc import Callable, Iterator
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any
 
+import markdown
 import pytest
-from PyQt6.QtCore import QEvent, QSettings, Qt
-from PyQt6.QtGui import QKeyEvent
-from PyQt6.QtWidgets import QMessageBox, QTextBrowser, QTextEdit
+from PyQt6.QtCore import QEvent, QSettings, Qt, QThread, QThreadPool, QTimer, QUrl, pyqtSignal
+from PyQt6.QtGui import QKeyEvent, QTextCursor
+from PyQt6.QtWidgets import QMessageBox, QPlainTextEdit, QTextBrowser, QWidget
 
 from pymd.services.exporters.base import IExporter, IExporterRegistry
 from pymd.services.file_service import FileService
 from pymd.services.markdown_renderer import MarkdownRenderer
 from pymd.services.settings_service import SettingsService
+from pymd.services.ui import main_window as main_window_mod
 from pymd.services.ui.main_window import MainWindow
-from pymd.utils.constants import MAX_RECENTS
+from pymd.services.ui.preview_patch import patch_script
+from pymd.utils.constants import MAX_RECENTS, SETTINGS_NATIVE_MARKDOWN
 
 
 # ------------------------------
@@ -121,8 +126,23 @@ def exporter_registry() -> IExporterRegistry:
     return reg
 
 
+def _wait_for_render(qapp, window: MainWindow | None = None) -> None:
+    """
+    Let pooled preview renders finish and deliver their queued results.
+    With `window`, a pending debounced render is started first instead of waiting for it.
+    """
+    qapp.processEvents()  # deliver zero-delay timers (e.g. the first render after show)
+    if window is not None and window._render_timer.isActive():
+        window._render_timer.stop()
+        window._render_preview()
+    QThreadPool.globalInstance().waitForDone()
+    qapp.processEvents()
+
+
 @pytest.fixture()
-def window(qapp, tmp_path: Path, exporter_registry: IExporterRegistry, monkeypatch) -> MainWindow:
+def window(
+    qapp, tmp_path: Path, exporter_registry: IExporterRegistry, monkeypatch
+) -> Iterator[MainWindow]:
     """
     Build a MainWindow with file-backed QSettings (isolated per test) and a stub AboutDialog,
     plus an injected exporter registry containing DummyExporter.
@@ -145,8 +165,33 @@ def window(qapp, tmp_path: Path, exporter_registry: IExporterRegistry, monkeypat
         start_path=None,
     )
     w.show()
-    qapp.processEvents()
-    return w
+    _wait_for_render(qapp)
+    yield w
+    _wait_for_render(qapp)
+
+
+@pytest.fixture()
+def make_window(window: MainWindow, qapp) -> Iterator[Callable[[], MainWindow]]:
+    """Build more windows sharing `window`'s services; they are closed on teardown."""
+    made: list[MainWindow] = []
+
+    def factory() -> MainWindow:
+        w = MainWindow(
+            app_title="Extra",
+            config=DummyConfig(),
+            renderer=window.renderer,
+            file_service=window.file_service,
+            settings=window.settings,
+            exporter_registry=window._exporters,
+        )
+        made.append(w)
+        return w
+
+    yield factory
+    for w in made:
+        w.close()
+        w.deleteLater()
+    _wait_for_render(qapp)
 
 
 # ------------------------------
@@ -155,13 +200,26 @@ def window(qapp, tmp_path: Path, exporter_registry: IExporterRegistry, monkeypat
 def test_window_initial_state(window: MainWindow):
     assert window.doc.path is None
     assert window.doc.modified is False
-    assert isinstance(window.editor, QTextEdit)
+    assert isinstance(window.editor, QPlainTextEdit)
     assert isinstance(window.preview, QTextBrowser)
 
     html = window.preview.toHtml().lower()
     assert "<html" in html
 
 
+def test_preview_widget_is_created_after_first_show(make_window, qapp):
+    w = make_window()
+    assert not isinstance(w.preview, QTextBrowser)
+    w._render_preview()
+    assert not w._preview_ready  # not shown yet
+
+    w.show()
+    _wait_for_render(qapp, w)
+    assert isinstance(w.preview, QTextBrowser)
+    assert w.splitter.widget(1) is w.preview
+    assert w.preview.isVisible()
+
+
 def test_window_open_save_cycle(tmp_path: Path, window: MainWindow):
     src = tmp_path / "a.md"
     src.write_text("# Hello", encoding="utf-8")
@@ -179,6 +237,143 @@ def test_window_open_save_cycle(tmp_path: Path, window: MainWindow):
     assert window.doc.modified is False
 
 
+def test_open_renders_once_and_leaves_document_unmodified(
+    tmp_path: Path, window: MainWindow, monkeypatch, qapp
+):
+    src = tmp_path / "a.md"
+    src.write_text("# Hello", encoding="utf-8")
+    starts: list[str] = []
+    real_start = window._start_render
+
+    def spy(text: str) -> int:
+        starts.append(text)
+        return real_start(text)
+
+    monkeypatch.setattr(window, "_start_render", spy)
+
+    window._open_path(src)
+    _wait_for_render(qapp)
+
+    assert starts == ["# Hello"]
+    assert window.doc.modified is False
+    assert "•" not in window.windowTitle()
+    assert "Hello" in window.preview.toPlainText()
+
+
+def test_large_file_is_loaded_in_chunks(tmp_path: Path, window: MainWindow, monkeypatch, qtbot):
+    monkeypatch.setattr("pymd.services.ui.main_window.EDITOR_CHUNKED_LOAD_MIN_CHARS", 10)
+    monkeypatch.setattr("pymd.services.ui.main_window.EDITOR_LOAD_CHUNK_CHARS", 8)
+    text = "\n".join(f"line {i}" for i in range(20))
+    src = tmp_path / "big.md"
+    src.write_text(text, encoding="utf-8")
+
+    window._open_path(src)
+    assert window.editor.toPlainText() == text[:8]
+    assert window.editor.isReadOnly()
+    assert window._text() == text  # render/save see the whole file already
+
+    qtbot.waitUntil(lambda: not window.editor.isReadOnly(), timeout=2000)
+    assert window.editor.toPlainText() == text
+    assert window.doc.modified is False
+    assert not window.editor.document().isUndoAvailable()
+
+
+def test_big_file_is_read_off_the_gui_thread(
+    tmp_path: Path, window: MainWindow, monkeypatch, qtbot
+):
+    monkeypatch.setattr("pymd.services.ui.main_window.ASYNC_READ_MIN_BYTES", 1)
+    src = tmp_path / "big.md"
+    src.write_text("# Big", encoding="utf-8")
+
+    window._open_path(src)
+    assert window.doc.path is None  # not applied until the read comes back
+    assert window.editor.isReadOnly()
+
+    qtbot.waitUntil(lambda: window.doc.path == src, timeout=2000)
+    assert window.editor.toPlainText() == "# Big"
+    assert not window.editor.isReadOnly()
+    assert window.recents[:1] == [str(src)]
+
+
+def test_new_file_drops_a_pending_read(tmp_path: Path, window: MainWindow, monkeypatch, qapp):
+    monkeypatch.setattr("pymd.services.ui.main_window.ASYNC_READ_MIN_BYTES", 1)
+    src = tmp_path / "big.md"
+    src.write_text("# Big", encoding="utf-8")
+
+    window._open_path(src)
+    window._new_file()
+    QThreadPool.globalInstance().waitForDone()
+    qapp.processEvents()
+
+    assert window.doc.path is None
+    assert window.editor.toPlainText() == ""
+
+
+def test_big_document_is_saved_off_the_gui_thread(
+    tmp_path: Path, window: MainWindow, monkeypatch, qtbot
+):
+    monkeypatch.setattr("pymd.services.ui.main_window.ASYNC_SAVE_MIN_CHARS", 1)
+    dest = tmp_path / "a.md"
+    dest.write_text("old", encoding="utf-8")
+    window._open_path(dest)
+    window.editor.setPlainText("new text")
+
+    window._save()
+    assert window.doc.modified is True  # until the write is confirmed
+
+    qtbot.waitUntil(lambda: not window.doc.modified, timeout=2000)
+    assert dest.read_text(encoding="utf-8") == "new text"
+
+
+def test_new_file_right_after_background_save_does_not_ask(
+    tmp_path: Path, window: MainWindow, monkeypatch
+):
+    monkeypatch.setattr("pymd.services.ui.main_window.ASYNC_SAVE_MIN_CHARS", 1)
+    monkeypatch.setattr(
+        "pymd.services.ui.main_window.QMessageBox.question",
+        lambda *a, **k: pytest.fail("asked to discard text that was being saved"),
+    )
+    dest = tmp_path / "a.md"
+    window.doc.path = dest
+    window.editor.setPlainText("new text")
+
+    window._save()
+    window._new_file()
+
+    assert dest.read_text(encoding="utf-8") == "new text"
+    assert window.editor.toPlainText() == ""
+
+
+def test_close_waits_for_background_save(tmp_path: Path, window: MainWindow, monkeypatch):
+    monkeypatch.setattr("pymd.services.ui.main_window.ASYNC_SAVE_MIN_CHARS", 1)
+    dest = tmp_path / "a.md"
+    window.doc.path = dest
+    window.editor.setPlainText("last words")
+
+    window._save()
+    window.close()
+
+    assert not window._writes
+    assert dest.read_text(encoding="utf-8") == "last words"
+
+
+def test_edit_during_background_save_keeps_document_modified(
+    tmp_path: Path, window: MainWindow, monkeypatch, qtbot
+):
+    monkeypatch.setattr("pymd.services.ui.main_window.ASYNC_SAVE_MIN_CHARS", 1)
+    dest = tmp_path / "a.md"
+    dest.write_text("old", encoding="utf-8")
+    window._open_path(dest)
+    window.editor.setPlainText("saved")
+
+    window._save()
+    window.editor.insertPlainText(" and more")
+
+    qtbot.waitUntil(lambda: not window._writes, timeout=2000)
+    assert dest.read_text(encoding="utf-8") == "saved"
+    assert window.doc.modified is True
+
+
 def test_window_write_failure_shows_error(monkeypatch, tmp_path: Path, window: MainWindow):
     monkeypatch.setattr(QMessageBox, "critical", lambda *a, **k: None)
 
@@ -192,6 +387,8 @@ def test_window_write_failure_shows_error(monkeypatch, tmp_path: Path, window: M
 def test_export_action_flows_through_registry(monkeypatch, tmp_path: Path, window: MainWindow):
     window.editor.setPlainText("# Title\n\nText")
 
+    assert window.export_actions == []  # built lazily
+    window._file_menu.aboutToShow.emit()
     assert window.export_actions
     act = window.export_actions[0]
 
@@ -207,7 +404,80 @@ def test_export_action_flows_through_registry(monkeypatch, tmp_path: Path, windo
     assert "<html" in data
 
 
-def test_recents_persist_roundtrip(window: MainWindow, tmp_path: Path, qapp):
+def test_thread_safe_exporter_runs_off_the_gui_thread(
+    monkeypatch, tmp_path: Path, window: MainWindow, qtbot
+):
+    threads: list[object] = []
+    real_to_html = window.renderer.to_html
+
+    def to_html(text: str) -> str:
+        threads.append(QThread.currentThread())
+        return real_to_html(text)
+
+    monkeypatch.setattr(window.renderer, "to_html", to_html)
+    window.editor.setPlainText("# Fresh")  # not rendered by anyone yet
+
+    class ThreadSafeExporter(DummyExporter):
+        thread_safe = True
+
+        def export(self, html: str, out_path: Path) -> None:
+            threads.append(QThread.currentThread())
+            super().export(html, out_path)
+
+    out = tmp_path / "doc.txt"
+    monkeypatch.setattr(
+        "pymd.services.ui.main_window.QFileDialog.getSaveFileName",
+        lambda *a, **k: (str(out), ""),
+    )
+    window._export_with(ThreadSafeExporter())
+
+    qtbot.waitUntil(lambda: not window._exports, timeout=2000)
+    assert "Fresh" in out.read_text(encoding="utf-8")
+    # Render and export both ran on the pool; the result is cached for the next export.
+    assert len(threads) == 2 and all(t is not window.thread() for t in threads)
+    assert window._cached_html(window._text()) == out.read_text(encoding="utf-8")
+
+
+def test_export_actions_are_built_once_on_first_menu_show(window: MainWindow):
+    window._file_menu.aboutToShow.emit()
+    built = list(window.export_actions)
+    window._export_menu.aboutToShow.emit()
+    window._file_menu.aboutToShow.emit()
+
+    assert built and window.export_actions == built
+    assert window._export_menu.actions() == built
+    assert all(a in window._file_menu.actions() for a in built)
+
+
+def test_select_image_uses_file_name_as_alt_text(monkeypatch, tmp_path: Path, window: MainWindow):
+    img = tmp_path / "photo.jpeg"
+    monkeypatch.setattr(
+        "pymd.services.ui.main_window.QFileDialog.getOpenFileName",
+        lambda *a, **k: (str(img), ""),
+    )
+
+    window.act_img.trigger()
+
+    assert window.editor.toPlainText() == (
+        f'<img src="{img.as_posix()}" width="300" alt="photo.jpeg" />'
+    )
+
+
+def test_select_image_escapes_attribute_values(monkeypatch, tmp_path: Path, window: MainWindow):
+    img = tmp_path / 'a "b" & c.png'
+    monkeypatch.setattr(
+        "pymd.services.ui.main_window.QFileDialog.getOpenFileName",
+        lambda *a, **k: (str(img), ""),
+    )
+
+    window.act_img.trigger()
+
+    text = window.editor.toPlainText()
+    assert 'alt="a &quot;b&quot; &amp; c.png"' in text
+    assert '"b"' not in text
+
+
+def test_recents_persist_roundtrip(window: MainWindow, make_window, tmp_path: Path, qapp):
     p = tmp_path / "r.md"
     p.write_text("ok", encoding="utf-8")
     window._open_path(p)
@@ -216,18 +486,78 @@ def test_recents_persist_roundtrip(window: MainWindow, tmp_path: Path, qapp):
     window.close()
     qapp.processEvents()
 
-    w2 = MainWindow(
-        app_title="Test2",
-        config=DummyConfig(),
-        renderer=MarkdownRenderer(),
-        file_service=FileService(),
-        settings=window.settings,  # same SettingsService backend
-        exporter_registry=window._exporters,
-        start_path=None,
-    )
+    w2 = make_window()  # same SettingsService backend
     assert w2.recents[:1] == [str(p)]
 
 
+def test_close_skips_settings_write_when_state_unchanged(
+    window: MainWindow, monkeypatch: pytest.MonkeyPatch, qapp
+):
+    calls: list[dict] = []
+    monkeypatch.setattr(window.settings, "save_all", lambda **kw: calls.append(kw))
+
+    window.close()
+    qapp.processEvents()
+    assert len(calls) == 1 and calls[0]["recents"] is None
+
+    window.show()
+    window.close()
+    qapp.processEvents()
+    assert len(calls) == 1
+
+
+def test_dialogs_are_built_on_first_use(window: MainWindow):
+    assert window._find_dialog is None and window._table_dialog is None
+    dlg = window.find_dialog
+    assert dlg is window.find_dialog
+    assert window._table_dialog is None
+
+
+def test_tab_stop_follows_editor_font(window: MainWindow):
+    before = window.editor.tabStopDistance()
+    font = window.editor.font()
+    font.setPointSizeF(font.pointSizeF() * 3)
+    window.editor.setFont(font)
+    assert window.editor.tabStopDistance() > before
+
+
+def test_preview_resolves_relative_paths_from_document_folder(
+    window: MainWindow, tmp_path: Path, qapp
+):
+    p = tmp_path / "doc.md"
+    p.write_text("![pic](img/pic.png)", encoding="utf-8")
+    window._open_path(p)
+    _wait_for_render(qapp, window)
+
+    base = window.preview.document().baseUrl()
+    assert base.toLocalFile().rstrip("/") == str(tmp_path)
+    assert base.resolved(QUrl("img/pic.png")).toLocalFile() == str(tmp_path / "img" / "pic.png")
+
+
+def test_render_cache_is_dropped_when_another_document_loads(
+    window: MainWindow, tmp_path: Path, qapp
+):
+    window.editor.setPlainText("# Old")
+    window._to_html(window._text())
+    assert window._html_cache
+
+    p = tmp_path / "new.md"
+    p.write_text("# New", encoding="utf-8")
+    window._open_path(p)
+    assert all(text == "# New" for text, _ in window._html_cache.values())
+
+
+def test_title_updates_only_when_modified_flag_flips(window: MainWindow, monkeypatch):
+    window.editor.setPlainText("a")
+    assert window.windowTitle().endswith("• — Markdown Editor")
+
+    calls = {"n": 0}
+    monkeypatch.setattr(window, "_update_title", lambda: calls.__setitem__("n", calls["n"] + 1))
+    window.editor.insertPlainText("b")
+    window.editor.insertPlainText("c")
+    assert calls["n"] == 0
+
+
 def test_confirm_discard_negative(window: MainWindow, monkeypatch):
     monkeypatch.setattr(QMessageBox, "question", lambda *a, **k: QMessageBox.StandardButton.No)
     window.doc.modified = True
@@ -255,9 +585,9 @@ def test_confirm_discard_no_dialog_when_unmodified(window: MainWindow, monkeypat
 
 def test_window_toggles(window: MainWindow, qapp):
     window._toggle_wrap(False)
-    assert window.editor.lineWrapMode() == QTextEdit.LineWrapMode.NoWrap
+    assert window.editor.lineWrapMode() == QPlainTextEdit.LineWrapMode.NoWrap
     window._toggle_wrap(True)
-    assert window.editor.lineWrapMode() == QTextEdit.LineWrapMode.WidgetWidth
+    assert window.editor.lineWrapMode() == QPlainTextEdit.LineWrapMode.WidgetWidth
 
     window._toggle_preview(False)
     qapp.processEvents()
@@ -267,6 +597,335 @@ def test_window_toggles(window: MainWindow, qapp):
     assert window.preview.isVisible() is True
 
 
+def test_hidden_preview_skips_render_until_shown(window: MainWindow, monkeypatch, qapp):
+    calls = {"n": 0}
+    real_render = window.renderer.to_anchored_html
+
+    def spy(text: str) -> str:
+        calls["n"] += 1
+        return real_render(text)
+
+    monkeypatch.setattr(window.renderer, "to_anchored_html", spy)
+
+    window._toggle_preview(False)
+    window.editor.setPlainText("# Hidden")
+    window.editor.setPlainText("# Hidden edit")
+    assert not window._render_timer.isActive()
+    assert calls["n"] == 0
+
+    window._toggle_preview(True)
+    _wait_for_render(qapp)
+    assert calls["n"] == 1
+    assert "Hidden edit" in window.preview.toPlainText()
+
+
+def test_native_markdown_preview_bypasses_renderer(window: MainWindow, monkeypatch, qapp):
+    monkeypatch.setattr(window, "_native_markdown", True)
+    monkeypatch.setattr(window, "_start_render", lambda text: pytest.fail("rendered HTML"))
+
+    window.editor.setPlainText("# Native\n\n*text*")
+    window._render_preview()
+
+    assert window.preview.toPlainText().split() == ["Native", "text"]
+
+
+def test_native_markdown_is_read_from_settings(window: MainWindow, make_window):
+    window.settings.set_raw(SETTINGS_NATIVE_MARKDOWN, "on")
+    assert make_window()._native_markdown is True
+
+
+def test_edits_are_debounced_into_one_render(window: MainWindow, monkeypatch, qtbot):
+    starts: list[str] = []
+    real_start = window._start_render
+
+    def spy(text: str) -> int:
+        starts.append(text)
+        return real_start(text)
+
+    monkeypatch.setattr(window, "_start_render", spy)
+    for ch in "abc":
+        window.editor.insertPlainText(ch)
+    assert starts == []
+
+    qtbot.waitUntil(lambda: bool(starts), timeout=2000)
+    assert starts == ["abc"]
+
+    window._render_preview()  # unchanged text: nothing to do
+    assert starts == ["abc"]
+
+
+def test_rerender_keeps_preview_scrolled_to_same_block(window: MainWindow, qapp):
+    window.editor.setPlainText("\n\n".join(f"paragraph {i}" for i in range(300)))
+    _wait_for_render(qapp, window)
+    window.preview.scrollToAnchor("blk-120")
+    qapp.processEvents()
+    top = window._top_block_index()
+    assert top >= 100
+
+    window.editor.moveCursor(QTextCursor.MoveOperation.End)
+    window.editor.insertPlainText(" edited")
+    _wait_for_render(qapp, window)
+
+    assert window._top_block_index() == top
+
+
+def test_top_block_lookup_skips_preview_without_anchors(window: MainWindow, qapp, monkeypatch):
+    # Document-scoped Markdown renders without blk-N anchors: no block walk at all.
+    window.editor.setPlainText("\n\n".join(f"[r{i}]: https://x/{i}" for i in range(300)))
+    _wait_for_render(qapp, window)
+    assert not window._preview_anchored
+    monkeypatch.setattr(
+        window.preview, "cursorForPosition", lambda *_: pytest.fail("walked the preview")
+    )
+    assert window._top_block_index() == 0
+
+
+def test_render_runs_off_thread_and_drops_stale_results(window: MainWindow, qapp):
+    window.editor.setPlainText("# Fresh")
+    _wait_for_render(qapp, window)
+    assert "Fresh" in window.preview.toPlainText()
+
+    # A result from an older generation must not overwrite the current preview.
+    window._on_render_done(window._render_gen - 1, "<html><body>Stale</body></html>")
+    assert "Stale" not in window.preview.toPlainText()
+
+
+def test_revisited_text_is_served_from_render_cache(window: MainWindow, monkeypatch, qapp):
+    window.editor.setPlainText("# First")
+    _wait_for_render(qapp, window)
+    window.editor.setPlainText("# Second")
+    _wait_for_render(qapp, window)
+
+    workers: list[object] = []
+    real_worker = main_window_mod.TaskWorker
+    monkeypatch.setattr(
+        main_window_mod, "TaskWorker", lambda *a: workers.append(a) or real_worker(*a)
+    )
+    window.editor.setPlainText("# First")
+    _wait_for_render(qapp, window)
+
+    assert workers == []
+    assert "First" in window.preview.toPlainText()
+
+
+def test_export_reuses_cached_html(window: MainWindow, monkeypatch, tmp_path: Path):
+    calls: list[str] = []
+    real_to_html = window.renderer.to_html
+    monkeypatch.setattr(window.renderer, "to_html", lambda t: calls.append(t) or real_to_html(t))
+    window.editor.setPlainText("# Title")
+
+    assert window._to_html(window._text()) == window._to_html(window._text())
+    assert calls == ["# Title"]
+
+
+def test_export_reuses_the_web_preview_render(
+    web_window: MainWindow, monkeypatch, qapp, qtbot, tmp_path: Path
+):
+    w = web_window
+    w.editor.setPlainText("# Title\n\nSome *text*")
+    _wait_for_render(qapp, w)
+    qtbot.waitUntil(lambda: w._dom_blocks is not None and len(w._dom_blocks) == 2)
+    expected = w.renderer.to_html(w._text())
+
+    converted: list[str] = []
+    real = markdown.Markdown.convert
+    monkeypatch.setattr(
+        markdown.Markdown, "convert", lambda md, src: converted.append(src) or real(md, src)
+    )
+    out = tmp_path / "out.txt"
+    monkeypatch.setattr(
+        "pymd.services.ui.main_window.QFileDialog.getSaveFileName",
+        lambda *a, **k: (str(out), ""),
+    )
+    w._export_with(DummyExporter())
+
+    assert converted == []
+    # Same markup; only the newlines between top-level elements may differ.
+    exported = out.read_text(encoding="utf-8")
+    assert re.sub(r">\s+<", "><", exported) == re.sub(r">\s+<", "><", expected)
+
+
+class FakeWebPage:
+    def __init__(self) -> None:
+        self.scripts: list[str] = []
+
+    def runJavaScript(self, js: str, callback: Any) -> None:
+        self.scripts.append(js)
+        callback(True)
+
+
+class FakeWebView(QWidget):
+    """
+    Stands in for QWebEngineView: setHtml/page()/loadFinished only. Like the real view,
+    setHtml() returns before the page has loaded; with auto_load=False the test emits
+    loadFinished itself.
+    """
+
+    loadFinished = pyqtSignal(bool)
+
+    def __init__(self, parent: QWidget | None = None, auto_load: bool = True) -> None:
+        super().__init__(parent)
+        self.html_loads: list[str] = []
+        self.base_url: QUrl | None = None
+        self._auto_load = auto_load
+        self._page = FakeWebPage()
+
+    def setHtml(self, html: str, base_url: QUrl | None = None) -> None:
+        self.html_loads.append(html)
+        self.base_url = base_url
+        if self._auto_load:
+            QTimer.singleShot(0, lambda: self.loadFinished.emit(True))
+
+    def page(self) -> FakeWebPage:
+        return self._page
+
+
+@pytest.fixture()
+def web_window(make_window, monkeypatch, qapp, qtbot) -> MainWindow:
+    """A shown window whose preview is a FakeWebView with its warm-up page loaded."""
+    monkeypatch.setattr(MainWindow, "_create_preview_widget", lambda self: FakeWebView(self))
+    w = make_window()
+    w.show()
+    _wait_for_render(qapp, w)
+    qtbot.waitUntil(lambda: w._dom_loaded, timeout=2000)
+    return w
+
+
+def test_webengine_preview_patches_changed_blocks(web_window: MainWindow, qapp, qtbot):
+    w = web_window
+    view = w.preview
+    assert isinstance(view, FakeWebView)
+
+    w.editor.setPlainText("# A\n\none\n\ntwo")
+    _wait_for_render(qapp, w)
+    qtbot.waitUntil(lambda: w._dom_blocks is not None and len(w._dom_blocks) == 3)
+    loads = len(view.html_loads)
+    assert 'id="pymd-root"' in view.html_loads[-1]
+    scripts = view.page().scripts
+    del scripts[:]
+
+    w.editor.setPlainText("# A\n\nONE\n\ntwo")
+    _wait_for_render(qapp, w)
+    assert len(view.html_loads) == loads  # patched in place, no setHtml
+    assert len(scripts) == 1
+    assert "ONE" in scripts[0] and "two" not in scripts[0]
+
+
+def test_webengine_preview_warms_up_with_an_empty_page(web_window: MainWindow, qapp):
+    w = web_window
+    view = w.preview
+    assert len(view.html_loads) == 1
+    assert '<div id="pymd-root"></div>' in view.html_loads[0]
+
+    w.editor.setPlainText("# First")
+    _wait_for_render(qapp, w)
+    assert len(view.html_loads) == 1  # first content arrives as a patch
+    assert "First" in view.page().scripts[-1]
+
+
+def test_webengine_preview_holds_blocks_until_the_page_has_loaded(make_window, monkeypatch, qapp):
+    monkeypatch.setattr(
+        MainWindow, "_create_preview_widget", lambda self: FakeWebView(self, auto_load=False)
+    )
+    w = make_window()
+    w.show()
+    _wait_for_render(qapp, w)
+    view = w.preview
+
+    w.editor.setPlainText("# First")
+    _wait_for_render(qapp, w)
+    assert view.page().scripts == []  # warm-up page still loading: nothing to patch yet
+
+    view.loadFinished.emit(True)
+    assert len(view.html_loads) == 1  # no second full load
+    assert len(view.page().scripts) == 1 and "First" in view.page().scripts[0]
+
+
+def test_webengine_preview_base_url_is_not_file_scheme(
+    web_window: MainWindow, qapp, tmp_path: Path
+):
+    w = web_window
+    p = tmp_path / "doc.md"
+    p.write_text("![pic](img/pic.png)", encoding="utf-8")
+    w._open_path(p)
+    _wait_for_render(qapp, w)
+
+    base = w.preview.base_url
+    assert base is not None and base.scheme() == "pymd-doc"
+    pic = base.resolved(QUrl("img/pic.png"))
+    pic.setScheme("file")
+    assert pic.toLocalFile() == str(tmp_path / "img" / "pic.png")
+
+
+def test_webengine_preview_shows_first_screen_then_patches_in_the_rest(
+    web_window: MainWindow, monkeypatch, qapp, qtbot
+):
+    monkeypatch.setattr("pymd.services.ui.main_window.PREVIEW_LAZY_MIN_CHARS", 0)
+    w = web_window
+    scripts = w.preview.page().scripts
+
+    w.editor.setPlainText("\n\n".join(f"para {i}" for i in range(600)))
+    _wait_for_render(qapp, w)
+    qtbot.waitUntil(lambda: len(scripts) >= 2, timeout=2000)
+
+    assert "para 0" in scripts[0] and "para 599" not in scripts[0]
+    assert "para 0" not in scripts[1] and "para 599" in scripts[1]  # appended, not reloaded
+    assert w._dom_blocks is not None and len(w._dom_blocks) == 600
+
+
+def test_webengine_preview_patches_only_the_edited_block_of_a_large_document(
+    web_window: MainWindow, monkeypatch, qapp, qtbot
+):
+    monkeypatch.setattr("pymd.services.ui.main_window.PREVIEW_LAZY_MIN_CHARS", 0)
+    w = web_window
+    scripts = w.preview.page().scripts
+    w.editor.setPlainText("\n\n".join(f"para {i}" for i in range(600)))
+    _wait_for_render(qapp, w)
+    qtbot.waitUntil(lambda: w._dom_blocks is not None and len(w._dom_blocks) == 600)
+    del scripts[:]
+
+    w.editor.moveCursor(QTextCursor.MoveOperation.End)
+    w.editor.insertPlainText(" edited")
+    _wait_for_render(qapp, w)
+
+    assert w._dom_blocks is not None and len(w._dom_blocks) == 600
+    assert scripts == [patch_script(599, 1, [w._dom_blocks[599]])]
+
+
+def test_webengine_preview_renders_the_rest_after_a_whole_document_head(
+    web_window: MainWindow, monkeypatch, qapp, qtbot
+):
+    monkeypatch.setattr("pymd.services.ui.main_window.PREVIEW_LAZY_MIN_CHARS", 0)
+    w = web_window
+    view = w.preview
+    # Repeated headings in the first screen: the head renders as a whole document.
+    paras = "\n\n".join(f"para {i}" for i in range(600))
+    w.editor.setPlainText(f"## Notes\n\none\n\n## Notes\n\n{paras}")
+    _wait_for_render(qapp, w)
+
+    qtbot.waitUntil(lambda: "para 599" in view.html_loads[-1], timeout=2000)
+
+
+def test_large_document_preview_renders_viewport_first(window: MainWindow, monkeypatch, qapp):
+    monkeypatch.setattr("pymd.services.ui.main_window.PREVIEW_LAZY_MIN_CHARS", 0)
+    window.editor.setPlainText("\n\n".join(f"para {i}" for i in range(600)))
+    _wait_for_render(qapp, window)
+
+    shown = window.preview.toPlainText()
+    assert "para 0" in shown
+    assert "para 599" not in shown
+
+    # Scrolling to the bottom renders the next slice; keep going until everything is in.
+    for _ in range(200):
+        if not window._lazy_blocks:
+            break
+        sb = window.preview.verticalScrollBar()
+        sb.setValue(sb.maximum())
+        _wait_for_render(qapp)
+    _wait_for_render(qapp)
+    assert "para 599" in window.preview.toPlainText()
+
+
 # ------------------------------
 # Formatting & header toggles
 # ------------------------------
@@ -329,6 +988,31 @@ def test_prefix_line_partial_multiline_selection(window: MainWindow):
     assert window.editor.toPlainText().splitlines()[:3] == ["a", "- b", "c"]
 
 
+def test_prefix_line_is_single_undo_step_and_keeps_lines_selected(window: MainWindow):
+    window.editor.setPlainText("a\nb\nc")
+    _select_range(window, 0, len("a\nb\nc"))
+    window.act_list.trigger()
+    assert window.editor.textCursor().selectedText().replace("\u2029", "\n") == "- a\n- b\n- c"
+
+    window.editor.undo()
+    assert window.editor.toPlainText() == "a\nb\nc"
+
+
+def test_prefix_line_reselects_text_outside_the_bmp(window: MainWindow):
+    window.editor.setPlainText("\U0001f600a\n\U0001f600b")
+    _select_range(window, 0, window.editor.document().characterCount() - 1)
+    window._prefix_line("- ")
+    selected = window.editor.textCursor().selectedText().replace("\u2029", "\n")
+    assert selected == "- \U0001f600a\n- \U0001f600b"
+
+
+def test_prefix_line_inserts_prefix_literally(window: MainWindow):
+    window.editor.setPlainText("a\nb")
+    _select_range(window, 0, 3)
+    window._prefix_line("\\g<0>\\1 ")
+    assert window.editor.toPlainText() == "\\g<0>\\1 a\n\\g<0>\\1 b"
+
+
 # ------------------------------
 # Smart paste: URL -> Markdown link
 # ------------------------------
@@ -410,6 +1094,22 @@ def test_event_filter_ctrl_e_inserts_simple_code_block(window: MainWindow):
     assert "```\n\n```\n" in text
 
 
+def test_simple_code_block_starts_on_its_own_line(window: MainWindow):
+    window.editor.setPlainText("start\n")
+    c = window.editor.textCursor()
+    c.movePosition(c.MoveOperation.End)
+    window.editor.setTextCursor(c)
+    window._insert_fenced_code_block_simple()
+    assert window.editor.toPlainText() == "start\n```\n\n```\n"
+
+    window.editor.setPlainText("mid")
+    c = window.editor.textCursor()
+    c.movePosition(c.MoveOperation.End)
+    window.editor.setTextCursor(c)
+    window._insert_fenced_code_block_simple()
+    assert window.editor.toPlainText() == "mid\n```\n\n```\n"
+
+
 # ------------------------------
 # Plugins: attach + menu behaviour
 # ------------------------------
@@ -527,3 +1227,71 @@ def test_recents_max_enforced(window: MainWindow, tmp_path: Path):
 
     assert len(window.recents) == MAX_RECENTS
     assert window.recents[0] == opened[-1]
+
+
+def test_reopening_most_recent_skips_settings_write(
+    window: MainWindow, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+):
+    p = tmp_path / "a.md"
+    p.write_text("a", encoding="utf-8")
+    window._open_path(p)
+
+    writes: list[list[str]] = []
+    monkeypatch.setattr(window.settings, "set_recent", writes.append)
+    window._open_path(p)
+
+    assert writes == []
+    assert window.recents[0] == str(p)
+
+
+def test_recent_menu_reuses_its_actions(window: MainWindow, tmp_path: Path):
+    before = window.recent_menu.actions()
+    a = tmp_path / "a.md"
+    a.write_text("a", encoding="utf-8")
+    window._open_path(a)
+    assert not any(act.isVisible() for act in window._recent_actions)  # refreshed on show
+
+    window.recent_menu.aboutToShow.emit()
+    assert window.recent_menu.actions() == before
+    visible = [act for act in before if act.isVisible()]
+    assert [act.text() for act in visible] == [str(a)]
+
+    window.editor.setPlainText("changed")
+    window.doc.modified = False
+    visible[0].trigger()
+    assert window.editor.toPlainText() == "a"
+
+
+def test_recents_writes_are_coalesced(
+    window: MainWindow, tmp_path: Path, monkeypatch: pytest.MonkeyPatch, qtbot
+):
+    writes: list[list[str]] = []
+    monkeypatch.setattr(window.settings, "set_recent", lambda r: writes.append(list(r)))
+    for name in ("a.md", "b.md", "c.md"):
+        p = tmp_path / name
+        p.write_text(name, encoding="utf-8")
+        window._open_path(p)
+    assert writes == []
+
+    qtbot.waitUntil(lambda: bool(writes), timeout=2000)
+    assert writes == [[str(tmp_path / n) for n in ("c.md", "b.md", "a.md")]]
+
+
+def test_plain_text_is_cached_until_next_edit(window: MainWindow, monkeypatch: pytest.MonkeyPatch):
+    window.editor.setPlainText("one")
+    calls = 0
+    real = window.editor.toPlainText
+
+    def counting() -> str:
+        nonlocal calls
+        calls += 1
+        return real()
+
+    monkeypatch.setattr(window.editor, "toPlainText", counting)
+    window._cached_text = None
+    assert window._text() == "one"
+    assert window._text() == "one"
+    assert calls == 1
+
+    window.editor.insertPlainText("two")
+    assert window._text() == "twoone"
@@ -0,0 +1,63 @@
+import re
+
+import pytest
+
+from pymd.services.markdown_blocks import has_document_scope, split_blocks
+from pymd.services.markdown_renderer import MarkdownRenderer
+
+
+def test_split_blocks_on_blank_lines():
+    assert split_blocks("# Title\n\npara one\nstill one\n\n\npara two") == [
+        "# Title",
+        "para one\nstill one",
+        "para two",
+    ]
+
+
+def test_split_blocks_keeps_fenced_code_together():
+    md = "intro\n\n```python\na = 1\n\n\nb = 2\n```\n\nafter"
+    assert split_blocks(md) == ["intro", "```python\na = 1\n\n\nb = 2\n```", "after"]
+
+
+def test_split_blocks_keeps_loose_list_and_continuations_together():
+    md = "- a\n\n- b\n\n    continued\n\nparagraph"
+    assert split_blocks(md) == ["- a\n\n- b\n\n    continued", "paragraph"]
+
+
+def test_split_blocks_empty_text():
+    assert split_blocks("") == []
+    assert split_blocks("\n\n\n") == []
+
+
+@pytest.mark.parametrize(
+    "md",
+    [
+        "# H\n\ntext with *em*\n\n```\ncode\n\nmore\n```\n\n1. one\n\n2. two\n\n> quote",
+        "| a | b |\n|---|---|\n| 1 | 2 |\n\n---\n\n$$\nx^2\n$$\n\n    indented\n\n    code",
+        "> a\n\n> b\n\n- x\n\n    more\n\n- y",
+    ],
+)
+def test_split_blocks_render_one_by_one_like_the_whole_text(md: str):
+    assert not has_document_scope(md)
+    r = MarkdownRenderer()
+    per_block = "".join(r._new_markdown().convert(b) for b in split_blocks(md))
+    whole = r._new_markdown().convert(md)
+    # Only the newlines between top-level elements differ.
+    assert re.sub(r">\s+<", "><", per_block) == re.sub(r">\s+<", "><", whole)
+
+
+def test_has_document_scope_detects_references_and_footnotes():
+    assert has_document_scope("see [x][1]\n\n[1]: https://example.com")
+    assert has_document_scope("text[^n]\n\n[^n]: note")
+    assert has_document_scope("[TOC]\n\n# H")
+    assert not has_document_scope("# plain\n\n[inline](https://example.com)")
+
+
+def test_has_document_scope_detects_definitions_and_raw_html_blocks():
+    assert has_document_scope("Term\n\n:   Definition")
+    assert has_document_scope("<div>\n\n*x*\n\n</div>")
+    assert not has_document_scope('text\n\n<img src="a.png" alt="a" />')
+
+
+def test_split_blocks_keeps_consecutive_blockquotes_together():
+    assert split_blocks("> a\n\n> b\n\npara\n\n> c") == ["> a\n\n> b", "para", "> c"]
@@ -1,7 +1,11 @@
 # tests/test_markdown_renderer.py
+import re
+
+import markdown
 import pytest
 
 from pymd.services.markdown_renderer import MarkdownRenderer
+from pymd.utils.constants import RETYPESET_HOOK
 
 
 @pytest.fixture
@@ -95,6 +99,13 @@ def test_katex_assets_and_wrapping_or_raw(renderer_katex: MarkdownRenderer):
     assert "tex-chtml.js" not in html
 
 
+@pytest.mark.parametrize("engine", ["mathjax", "katex"])
+def test_math_assets_define_the_retypeset_hook(engine):
+    # A patched web preview calls this for the block nodes it adds and removes.
+    html = MarkdownRenderer(math_engine=engine).to_document("")
+    assert f"window.{RETYPESET_HOOK} = function (added, removed)" in html
+
+
 def test_math_not_processed_inside_code_blocks(renderer_mathjax: MarkdownRenderer):
     # Dollars inside code fences should NOT become arithmatex
     md = r"""```python
@@ -116,3 +127,70 @@ def test_headers_and_toc_still_work(renderer_mathjax: MarkdownRenderer):
     assert "<h2" in html and "Heading 2" in html
     # toc extension typically adds id attributes; don't rely on exact format
     assert "id=" in html or "name=" in html
+
+
+def test_anchored_html_marks_each_block(renderer_mathjax: MarkdownRenderer):
+    md = "# Title\n\nSome **bold** text.\n\n```\ncode\n\nmore\n```"
+    html = renderer_mathjax.to_anchored_html(md)
+    assert [f'<a name="blk-{i}"></a>' in html for i in range(4)] == [True, True, True, False]
+    assert "<strong>bold</strong>" in html and "<pre" in html
+    assert html.lower().startswith("<!doctype html")
+
+
+def test_anchored_html_falls_back_for_document_scoped_markdown(
+    renderer_mathjax: MarkdownRenderer,
+):
+    md = "see [x][1]\n\n[1]: https://example.com"
+    assert renderer_mathjax.to_anchored_html(md) == renderer_mathjax.to_html(md)
+
+
+def test_html_blocks_only_render_changed_blocks(
+    renderer_mathjax: MarkdownRenderer, monkeypatch: pytest.MonkeyPatch
+):
+    first = renderer_mathjax.to_html_blocks("# A\n\npara one\n\npara two")
+    converted: list[str] = []
+    real = markdown.Markdown.convert
+
+    def spy(self: markdown.Markdown, source: str) -> str:
+        converted.append(source)
+        return real(self, source)
+
+    monkeypatch.setattr(markdown.Markdown, "convert", spy)
+    second = renderer_mathjax.to_html_blocks("# A\n\npara ONE\n\npara two")
+
+    assert converted == ["para ONE"]
+    assert second is not None and first is not None
+    assert second[0] == first[0] and second[2] == first[2]
+    assert "para ONE" in second[1]
+
+
+def _squash(html: str) -> str:
+    # Whole-document and per-block output differ only in newlines between top-level tags.
+    return re.sub(r">\s+<", "><", html)
+
+
+@pytest.mark.parametrize(
+    "md",
+    [
+        "# Usage\n\ntext\n\n# Usage\n\n[x](#usage_1)",
+        "Term\n\n:   Definition",
+        "T1\n: D1\n\nT2\n: D2",
+        "<div>\n\nhello *x*\n\n</div>",
+        "<!-- note\n\nstill a comment -->\n\npara",
+        "> a\n\n> b",
+        "> a\nlazy\n\n> b\n\npara\n\n> c",
+        "# H\n\npara *x*\n\n- a\n\n- b\n\n```\nc\n\nd\n```\n\n1. one\n\n2. two",
+        'para\n\n<img src="a.png" alt="a" />\n\n    code\n\n    more\n\n---\n\n$$\nx^2\n$$',
+    ],
+)
+def test_html_blocks_add_up_to_whole_document(renderer_mathjax: MarkdownRenderer, md: str):
+    blocks = renderer_mathjax.to_html_blocks(md)
+    if blocks is None:
+        return  # callers render the whole document instead
+    joined = renderer_mathjax.to_document("".join(blocks))
+    assert _squash(joined) == _squash(renderer_mathjax.to_html(md))
+
+
+def test_html_blocks_fall_back_for_repeated_headings(renderer_mathjax: MarkdownRenderer):
+    assert renderer_mathjax.to_html_blocks("# Usage\n\n# Usage") is None
+    assert renderer_mathjax.to_html_blocks("# Usage\n\n# Install") is not None
@@ -0,0 +1,25 @@
+import pytest
+from PyQt6.QtGui import QTextCursor
+from PyQt6.QtWidgets import QPlainTextEdit
+
+from pymd.services.ui.commands import PrefixLines, prefix_each_line
+
+
+def test_prefix_each_line_is_literal():
+    assert prefix_each_line("a\nb", "- ") == "- a\n- b"
+    assert prefix_each_line("a\nb", "\\g<0>x ") == "\\g<0>x a\n\\g<0>x b"
+    assert prefix_each_line("a", "\\1") == "\\1a"
+
+
+@pytest.mark.parametrize("prefix", ["> ", "\\g<0>x ", "\\1"])
+def test_prefix_lines_command_prefixes_selected_lines(qapp, prefix: str):
+    edit = QPlainTextEdit()
+    edit.setPlainText("a\nb\nc")
+    c = edit.textCursor()
+    c.setPosition(0)
+    c.setPosition(3, QTextCursor.MoveMode.KeepAnchor)  # "a\nb"
+    edit.setTextCursor(c)
+
+    PrefixLines(edit, prefix).execute()
+
+    assert edit.toPlainText() == f"{prefix}a\n{prefix}b\nc"
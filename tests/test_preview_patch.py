@@ -0,0 +1,46 @@
+import json
+
+import pytest
+
+from pymd.services.ui.preview_patch import ROOT_ID, blocks_html, diff_blocks, patch_script
+from pymd.utils.constants import RETYPESET_HOOK
+
+
+def test_diff_blocks_equal_lists():
+    assert diff_blocks(["a", "b"], ["a", "b"]) is None
+
+
+@pytest.mark.parametrize(
+    ("old", "new", "edit"),
+    [
+        (["a", "b", "c"], ["a", "X", "c"], (1, 1, ["X"])),
+        (["a", "c"], ["a", "b", "c"], (1, 0, ["b"])),
+        (["a", "b", "c"], ["a", "c"], (1, 1, [])),
+        (["a"], ["a", "b"], (1, 0, ["b"])),
+        ([], ["a"], (0, 0, ["a"])),
+        (["a", "a"], ["a", "a", "a"], (2, 0, ["a"])),
+        (["a", "b"], ["c"], (0, 2, ["c"])),
+    ],
+)
+def test_diff_blocks_minimal_edit(old: list[str], new: list[str], edit):
+    assert diff_blocks(old, new) == edit
+    start, delete, insert = edit
+    assert old[:start] + insert + old[start + delete :] == new
+
+
+def test_blocks_html_wraps_each_block_under_root():
+    assert blocks_html(["<p>a</p>", "<h1>b</h1>"]) == (
+        f'<div id="{ROOT_ID}"><div><p>a</p></div><div><h1>b</h1></div></div>'
+    )
+
+
+def test_patch_script_embeds_escaped_html():
+    js = patch_script(3, 2, ['<p>"quoted" </script></p>'])
+    assert json.dumps('<div><p>"quoted" </script></p></div>') in js
+    assert "root.children, 3, 3 + 2" in js and "root.children[3]" in js
+
+
+def test_patch_script_hands_nodes_to_the_retypeset_hook():
+    js = patch_script(0, 1, ["<p>$x$</p>"])
+    assert f"window[{json.dumps(RETYPESET_HOOK)}]" in js
+    assert "retypeset(added, removed)" in js
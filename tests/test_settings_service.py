@@ -1,4 +1,9 @@
 from pymd.services.settings_service import SettingsService
+from pymd.utils.constants import (
+    PREVIEW_DEBOUNCE_MS,
+    SETTINGS_NATIVE_MARKDOWN,
+    SETTINGS_PREVIEW_DEBOUNCE,
+)
 
 
 def test_settings_roundtrip_geometry(settings_service: SettingsService):
@@ -22,3 +27,26 @@ def test_settings_recents(settings_service: SettingsService):
     r = ["a.md", "b.md"]
     settings_service.set_recent(r)
     assert settings_service.get_recent() == r
+
+
+def test_settings_save_all_writes_given_values_only(settings_service: SettingsService):
+    settings_service.set_splitter(b"\x01")
+    settings_service.save_all(geometry=b"\x02", recents=["c.md"])
+    assert settings_service.get_geometry() == b"\x02"
+    assert settings_service.get_splitter() == b"\x01"
+    assert settings_service.get_recent() == ["c.md"]
+
+
+def test_settings_preview_debounce_ms(settings_service: SettingsService):
+    assert settings_service.get_preview_debounce_ms() == PREVIEW_DEBOUNCE_MS
+    settings_service.set_raw(SETTINGS_PREVIEW_DEBOUNCE, "350")
+    assert settings_service.get_preview_debounce_ms() == 350
+    settings_service.set_raw(SETTINGS_PREVIEW_DEBOUNCE, "soon")
+    assert settings_service.get_preview_debounce_ms() == PREVIEW_DEBOUNCE_MS
+
+
+def test_settings_native_markdown_accepts_documented_values(settings_service: SettingsService):
+    assert settings_service.get_native_markdown() is False
+    for value, expected in [("on", True), ("off", False), ("1", True), ("0", False), (True, True)]:
+        settings_service.set_raw(SETTINGS_NATIVE_MARKDOWN, value)
+        assert settings_service.get_native_markdown() is expected